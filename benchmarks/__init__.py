@@ -0,0 +1 @@
+"""Micro-benchmarks for hot paths. Run from the repository root, e.g. `python -m benchmarks.bench_extract`."""
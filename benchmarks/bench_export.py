@@ -0,0 +1,100 @@
+"""Time and peak memory of the exporters: the old pandas DataFrame path against the streaming writers.
+
+Usage: python -m benchmarks.bench_export [--rows 1000000] [--excel-rows 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from lead_scraper.exporter import EXPORT_COLUMNS, export_to_csv, export_to_excel, export_to_jsonl, export_to_parquet, pa
+
+
+# Previous implementation from exporter.py
+def legacy_csv(rows: List[Dict[str, str]], path: str) -> None:
+    df = pd.DataFrame(rows)
+    for col in EXPORT_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df = df[EXPORT_COLUMNS]
+    df.to_csv(path, index=False, encoding="utf-8-sig")
+
+
+def legacy_excel(rows: List[Dict[str, str]], path: str) -> None:
+    df = pd.DataFrame(rows)
+    for col in EXPORT_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df = df[EXPORT_COLUMNS]
+    df.to_excel(path, index=False)
+
+
+def make_rows(count: int, seed: int = 13) -> List[Dict[str, str]]:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(count):
+        row = {
+            "id": f"{rnd.getrandbits(128):032x}",
+            "name": f"Business {i} {rnd.choice(['Plumbing', 'Dental', 'Cafe', 'Roofing'])}",
+            "website": f"https://www.biz{i}.com/",
+            "email": f"info@biz{i}.com" if rnd.random() < 0.6 else "",
+            "phone": f"({rnd.randint(200, 999)}) {rnd.randint(200, 999)}-{rnd.randint(1000, 9999)}",
+            "address": f"{rnd.randint(1, 9999)} Main St, Springfield, IL",
+            "source": rnd.choice(["Yelp", "Yellow Pages", "Google Maps"]),
+            "score": rnd.choice([30, 60, 110]),
+            "status": "New",
+        }
+        # Optional fields are often missing, as they are in scraped rows
+        if rnd.random() < 0.3:
+            row["socials"] = f"https://facebook.com/biz{i}"
+        rows.append(row)
+    return rows
+
+
+def measure(fn: Callable[[List[Dict[str, str]], str], object], rows: List[Dict[str, str]], path: str):
+    # tracemalloc slows allocation-heavy code down a lot, so time and memory are separate runs
+    start = time.perf_counter()
+    fn(rows, path)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    tracemalloc.start()
+    fn(rows, path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    os.remove(path)
+    return elapsed, peak / 2**20, size / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--excel-rows", type=int, default=100000, help="Excel is much slower, so it runs on fewer rows")
+    args = parser.parse_args()
+    rows = make_rows(args.rows)
+    excel_rows = rows[:args.excel_rows]
+    cases = [
+        ("csv, pandas (old)", legacy_csv, rows, ".csv"),
+        ("csv, streaming", export_to_csv, rows, ".csv"),
+        ("jsonl, streaming", export_to_jsonl, rows, ".jsonl"),
+        ("xlsx, pandas (old)", legacy_excel, excel_rows, ".xlsx"),
+        ("xlsx, write-only", export_to_excel, excel_rows, ".xlsx"),
+    ]
+    if pa is not None:
+        cases.append(("parquet, streaming", export_to_parquet, rows, ".parquet"))
+    else:
+        print("pyarrow is not installed, skipping Parquet")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, fn, data, ext in cases:
+            elapsed, peak, size = measure(fn, data, os.path.join(tmp, "out" + ext))
+            print(f"{label:20s} {len(data):8d} rows  {elapsed:7.2f} s  peak {peak:8.1f} MiB  file {size:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
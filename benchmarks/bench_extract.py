@@ -0,0 +1,106 @@
+"""Compare the single-pass contact extractor with the previous per-kind regex passes.
+
+Usage: python -m benchmarks.bench_extract [--kb 2000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from lead_scraper.extract import SOCIAL_DOMAINS, extract_contacts
+from lead_scraper.utils import normalize_phone, validate_email
+
+# Previous implementation from details.py, kept here as the baseline
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
+
+
+def legacy_emails(text: str) -> List[str]:
+    found = []
+    for match in EMAIL_PATTERN.findall(text or ""):
+        if validate_email(match):
+            found.append(match)
+    return list(dict.fromkeys(found))
+
+
+def legacy_phones(text: str) -> List[str]:
+    found = set()
+    for match in PHONE_PATTERN.findall(text or ""):
+        normalized = normalize_phone(match)
+        if len(normalized) >= 7:
+            found.add(normalized)
+    return list(found)
+
+
+def legacy_socials(text: str) -> List[str]:
+    urls = set()
+    for domain in SOCIAL_DOMAINS:
+        pattern = re.compile(rf"https?://(?:www\.)?{re.escape(domain)}[^\s'\"]+", re.IGNORECASE)
+        for u in pattern.findall(text or ""):
+            urls.add(u)
+    return list(urls)
+
+
+def legacy(text: str):
+    return legacy_emails(text), legacy_phones(text), legacy_socials(text)
+
+
+def make_html(kb: int, seed: int = 7) -> str:
+    rnd = random.Random(seed)
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "plumbing", "service", "contact", "about", "2024"]
+    blocks = []
+    size = 0
+    i = 0
+    while size < kb * 1024:
+        i += 1
+        text = " ".join(rnd.choice(words) for _ in range(60))
+        block = f"<div class=\"section-{i}\"><p>{text}</p>"
+        if i % 20 == 0:
+            block += f"<a href=\"mailto:info{i}@acme{i % 7}.com\">Email us</a> sales{i}@shop{i % 5}.io"
+        if i % 25 == 0:
+            block += f"<a href=\"tel:+1-555-{i % 1000:03d}-{i % 10000:04d}\">Call</a> ({i % 900 + 100}) 555-{i % 10000:04d}"
+        if i % 35 == 0:
+            # Formatted tel: link whose number also appears bare, without the country code
+            block += f"<a href=\"tel:+1 ({i % 800 + 200}) 555-{i % 10000:04d}\">({i % 800 + 200}) 555-{i % 10000:04d}</a>"
+        if i % 30 == 0:
+            block += f"<a href=\"https://www.facebook.com/acme{i}\">fb</a><a href='https://instagram.com/acme{i}'>ig</a>"
+        block += "<script>var cfg = {\"id\": 1234, \"ts\": 1700000000};</script></div>\n"
+        blocks.append(block)
+        size += len(block)
+    return "<html><body>" + "".join(blocks) + "</body></html>"
+
+
+def bench(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kb", type=int, default=2000, help="size of the generated page in KiB")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = make_html(args.kb)
+    old = bench(legacy, html, args.repeat)
+    new = bench(extract_contacts, html, args.repeat)
+
+    old_e, old_p, old_s = legacy(html)
+    new_e, new_p, new_s = extract_contacts(html)
+    print(f"page size: {len(html) / 1024:.0f} KiB")
+    print(f"legacy (3 passes + per-match validation): {old * 1000:8.1f} ms")
+    print(f"single-pass engine:                       {new * 1000:8.1f} ms  ({old / new:.1f}x)")
+    print(f"emails  legacy={len(old_e):5d} engine={len(new_e):5d} same={set(old_e) == set(new_e)}")
+    print(f"phones  legacy={len(old_p):5d} engine={len(new_p):5d} same={set(old_p) == set(new_p)}")
+    print(f"socials legacy={len(old_s):5d} engine={len(new_s):5d} same={set(old_s) == set(new_s)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Compare result-page parsing on the BeautifulSoup path and the compiled-selector lxml backend,
+with and without each scraper's parse_scope.
+
+Usage: python -m benchmarks.bench_parsing [--cards 30] [--pages 20] [--filler 1] [--repeat 3]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from lead_scraper.parsing import LxmlBackend, SoupBackend
+from lead_scraper.sources.yellowpages import YellowPagesScraper
+from lead_scraper.sources.yelp import YelpScraper
+from lead_scraper.utils import normalize_space
+
+
+# Previous implementation from yellowpages.py, kept here as the baseline
+def legacy_yellowpages(html: str) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, "lxml")
+    rows: List[Dict[str, str]] = []
+    for c in soup.select("div.result, div.v-card"):
+        if c.select_one(".ad, .ad-label, .adBadge"):
+            continue
+        name_el = c.select_one("a.business-name, a.track-visit-website[aria-label]")
+        if not name_el:
+            name_el = c.select_one("a.business-name")
+        name = normalize_space(name_el.get_text(" ")) if name_el else ""
+        website_el = c.select_one("a.track-visit-website, a.website-link")
+        website = website_el.get("href") if website_el else ""
+        phone_el = c.select_one(".phones, .phone, .dish-phone")
+        phone = normalize_space(phone_el.get_text(" ")) if phone_el else ""
+        addr_el = c.select_one(".street-address")
+        locality_el = c.select_one(".locality")
+        address = normalize_space(
+            f"{addr_el.get_text(' ') if addr_el else ''} {locality_el.get_text(' ') if locality_el else ''}"
+        )
+        if not name:
+            continue
+        rows.append({"name": name, "website": website, "email": "", "phone": phone, "address": address, "socials": ""})
+    return rows
+
+
+# Previous implementation from yelp.py
+def legacy_yelp(html: str) -> List[Dict[str, str]]:
+    soup = BeautifulSoup(html, "lxml")
+    rows: List[Dict[str, str]] = []
+    for li in soup.select("ul li div.container__09f24__mpR8_"):
+        if li.select_one("[data-testid='adLabel']"):
+            continue
+        name_el = li.select_one("a.css-1m051bw") or li.select_one("a.css-19v1rkv")
+        name = normalize_space(name_el.get_text(" ")) if name_el else ""
+        website_el = li.find("a", string=lambda s: s and "website" in s.lower())
+        website = website_el.get("href") if website_el else ""
+        phone_el = li.select_one("p.css-1p9ibgf")
+        phone = normalize_space(phone_el.get_text(" ")) if phone_el else ""
+        address_el = li.select_one("address")
+        address = normalize_space(address_el.get_text(" ")) if address_el else ""
+        if not name:
+            continue
+        rows.append({"name": name, "website": website, "email": "", "phone": phone, "address": address, "socials": ""})
+    return rows
+
+
+FILLER = 1
+
+
+def _filler(rnd: random.Random) -> str:
+    # Navigation, inline scripts and footer markup that real listing pages carry around the results
+    links = "".join(f"<li><a href=\"/c/{rnd.randint(1, 9999)}\">Category {i}</a></li>" for i in range(60 * FILLER))
+    script = "<script>window.__STATE__ = {" + ",".join(f"\"k{i}\": {i}" for i in range(400 * FILLER)) + "};</script>"
+    return f"<nav><ul>{links}</ul></nav>{script}<footer>{links}</footer>"
+
+
+def make_yellowpages(cards: int, seed: int = 3) -> str:
+    rnd = random.Random(seed)
+    items = []
+    for i in range(cards):
+        ad = "<span class=\"ad-label\">Ad</span>" if i % 10 == 9 else ""
+        items.append(
+            f"<div class=\"result\"><div class=\"v-card\">{ad}<h2><a class=\"business-name\" href=\"/biz/{i}\">"
+            f"<span>Acme Plumbing {i}</span></a></h2>"
+            f"<a class=\"track-visit-website\" href=\"https://acme{i}.example.org\">Website</a>"
+            f"<div class=\"phones phone primary\">(555) {rnd.randint(100, 999)}-{rnd.randint(1000, 9999)}</div>"
+            f"<div class=\"street-address\">{i} Main St</div><div class=\"locality\">Springfield, IL</div></div></div>"
+        )
+    body = "<div class=\"search-results organic\">" + "".join(items) + "</div>"
+    return f"<html><head><title>t</title></head><body>{_filler(rnd)}{body}<div class=\"pagination\"><a class=\"next\" href=\"?page=2\">Next</a></div>{_filler(rnd)}</body></html>"
+
+
+def make_yelp(cards: int, seed: int = 5) -> str:
+    rnd = random.Random(seed)
+    items = []
+    for i in range(cards):
+        ad = "<span data-testid=\"adLabel\">Sponsored</span>" if i % 10 == 9 else ""
+        items.append(
+            f"<li><div class=\"container__09f24__mpR8_ x\">{ad}<h3><a class=\"css-19v1rkv\" href=\"/biz/{i}\">Cafe {i}</a></h3>"
+            f"<a href=\"https://cafe{i}.example.org\">Website</a>"
+            f"<p class=\"css-1p9ibgf\">(555) {rnd.randint(100, 999)}-{rnd.randint(1000, 9999)}</p>"
+            f"<address><p>{i} Market St</p><p>San Francisco, CA</p></address></div></li>"
+        )
+    # As on yelp.com: the result list in <main>, the pagination block after it, outside <main>
+    body = "<main id=\"main-content\"><ul class=\"list__09f24__ynIEd\">" + "".join(items) + "</ul></main>"
+    pagination = (
+        "<div aria-label=\"Pagination navigation\" class=\"pagination__09f24__VRjN4\" role=\"navigation\">"
+        "<a class=\"next-link\" href=\"?start=10\">Next Page</a></div>"
+    )
+    return f"<html><body>{_filler(rnd)}{body}{pagination}{_filler(rnd)}</body></html>"
+
+
+def bench(fn: Callable[[str], List[Dict[str, str]]], pages: List[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in pages:
+            fn(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def scraper_path(scraper, scoped: bool = False) -> Callable[[str], List[Dict[str, str]]]:
+    scope = scraper.parse_scope if scoped else None
+    return lambda html: scraper.parse_search_results(scraper.parser.parse(html, scope=scope))
+
+
+def finds_next(scraper, html: str, scoped: bool) -> bool:
+    # The scope must keep the pagination too, or the scraper stops after the first page
+    return scraper.has_next_page(scraper.parser.parse(html, scope=scraper.parse_scope if scoped else None), 1)
+
+
+def soup_peak_kib(scraper, html: str, scoped: bool) -> float:
+    # BeautifulSoup trees are Python objects, so tracemalloc sees their full size
+    tracemalloc.start()
+    scraper.parser.parse(html, scope=scraper.parse_scope if scoped else None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def lxml_elements(scraper, html: str, scoped: bool) -> int:
+    doc = scraper.parser.parse(html, scope=scraper.parse_scope if scoped else None)
+    return sum(1 for _ in doc.iter())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cards", type=int, default=30, help="result cards per page")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--filler", type=int, default=1, help="multiplier for the non-result markup around the cards")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    global FILLER
+    FILLER = max(1, args.filler)
+
+    cases = [
+        ("Yellow Pages", make_yellowpages, legacy_yellowpages, YellowPagesScraper),
+        ("Yelp", make_yelp, legacy_yelp, YelpScraper),
+    ]
+    for label, make, legacy, scraper_cls in cases:
+        pages = [make(args.cards, seed=i) for i in range(args.pages)]
+        soup_scraper = scraper_cls(parser=SoupBackend())
+        lxml_scraper = scraper_cls(parser=LxmlBackend())
+        variants = [
+            ("SoupBackend", soup_scraper, False),
+            ("SoupBackend, scoped", soup_scraper, True),
+            ("LxmlBackend", lxml_scraper, False),
+            ("LxmlBackend, scoped", lxml_scraper, True),
+        ]
+        old = bench(legacy, pages, args.repeat)
+        size = sum(len(p) for p in pages) / len(pages) / 1024
+        print(f"{label}: {args.pages} pages x {args.cards} cards, {size:.0f} KiB each")
+        print(f"  {'legacy BeautifulSoup':22s} {old * 1000:8.1f} ms")
+        for name, scraper, scoped in variants:
+            path = scraper_path(scraper, scoped)
+            t = bench(path, pages, args.repeat)
+            same = all(legacy(p) == path(p) for p in pages[:3])
+            print(f"  {name:22s} {t * 1000:8.1f} ms  ({old / t:4.1f}x)  same rows: {same}  next page: {finds_next(scraper, pages[0], scoped)}")
+        print(
+            f"  soup peak per page: {soup_peak_kib(soup_scraper, pages[0], False):.0f} KiB full, "
+            f"{soup_peak_kib(soup_scraper, pages[0], True):.0f} KiB scoped"
+        )
+        print(
+            f"  lxml elements in final tree: {lxml_elements(lxml_scraper, pages[0], False)} full, "
+            f"{lxml_elements(lxml_scraper, pages[0], True)} scoped"
+        )
+
+
+if __name__ == "__main__":
+    main()
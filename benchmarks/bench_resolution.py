@@ -0,0 +1,111 @@
+"""Time entity resolution on synthetic leads and score it against the known duplicates.
+
+Usage: python -m benchmarks.bench_resolution [--sizes 10000 50000 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List, Tuple
+
+from lead_scraper.resolution import EntityResolver
+
+WORDS = [
+    "Acme", "Blue", "Sky", "Joe's", "Golden", "River", "Summit", "Oak", "Prime", "Metro", "Harbor",
+    "Eagle", "Pioneer", "Valley", "Northside", "Lakeview", "Cedar", "Liberty", "Maple", "Granite",
+]
+TRADES = ["Plumbing", "Dental", "Roofing", "Bakery", "Auto Repair", "Law Office", "Fitness", "Electric", "Cafe", "Salon"]
+STREETS = ["Main St", "Oak Ave", "Market St", "2nd Ave", "Elm St", "Park Blvd", "Lake Rd", "Hill St"]
+SOURCES = ["Yelp", "Yellow Pages", "Google Maps"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "ben", "tor", "vel", "sa", "dun", "mar", "qui", "zen", "pol", "ari", "fen"]
+
+
+def _surname(rnd: random.Random) -> str:
+    return "".join(rnd.choice(SYLLABLES) for _ in range(rnd.randint(2, 3))).capitalize()
+
+
+def _variant(rnd: random.Random, business: Dict[str, str], source: str) -> Dict[str, str]:
+    """Same business as another directory would list it."""
+    name = business["name"]
+    if rnd.random() < 0.5:
+        name = name.replace("'", "")
+    if rnd.random() < 0.4:
+        name += rnd.choice([" LLC", " Inc", ", Inc.", " Co"])
+    if rnd.random() < 0.2:
+        name = name.upper()
+    digits = business["phone"]
+    phone = rnd.choice([
+        f"({digits[:3]}) {digits[3:6]}-{digits[6:]}",
+        f"+1 {digits[:3]}-{digits[3:6]}-{digits[6:]}",
+        f"{digits[:3]}.{digits[3:6]}.{digits[6:]}",
+    ]) if rnd.random() < 0.85 else ""
+    address = business["address"]
+    if rnd.random() < 0.5:
+        address = address.replace(" St", " Street").replace(" Ave", " Avenue")
+    if rnd.random() < 0.2:
+        address = ""
+    website = business["website"] if rnd.random() < 0.6 else ""
+    return {"name": name, "phone": phone, "address": address, "website": website, "email": "", "socials": "", "source": source}
+
+
+def make_leads(businesses: int, seed: int = 11) -> Tuple[List[Dict[str, str]], List[int]]:
+    rnd = random.Random(seed)
+    rows: List[Dict[str, str]] = []
+    truth: List[int] = []
+    for b in range(businesses):
+        business = {
+            "name": f"{rnd.choice(WORDS)} {_surname(rnd)} {rnd.choice(TRADES)}",
+            "phone": f"{rnd.randint(200, 999)}{rnd.randint(200, 999)}{rnd.randint(1000, 9999)}",
+            "address": f"{rnd.randint(1, 9999)} {rnd.choice(STREETS)}, Springfield",
+            "website": f"https://www.{_surname(rnd).lower()}{b}.com/" if rnd.random() < 0.7 else "",
+        }
+        for source in rnd.sample(SOURCES, rnd.randint(1, 3)):
+            rows.append(_variant(rnd, business, source))
+            truth.append(b)
+    order = list(range(len(rows)))
+    rnd.shuffle(order)
+    return [rows[i] for i in order], [truth[i] for i in order]
+
+
+def pair_scores(groups: List[List[int]], truth: List[int]) -> Tuple[float, float]:
+    predicted = set()
+    for g in groups:
+        for x in range(len(g)):
+            for y in range(x + 1, len(g)):
+                predicted.add((min(g[x], g[y]), max(g[x], g[y])))
+    by_entity: Dict[int, List[int]] = {}
+    for i, entity in enumerate(truth):
+        by_entity.setdefault(entity, []).append(i)
+    actual = set()
+    for members in by_entity.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                actual.add((min(members[x], members[y]), max(members[x], members[y])))
+    hits = len(predicted & actual)
+    precision = hits / len(predicted) if predicted else 1.0
+    recall = hits / len(actual) if actual else 1.0
+    return precision, recall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 50000, 100000], help="number of rows")
+    args = parser.parse_args()
+    resolver = EntityResolver()
+    for size in args.sizes:
+        rows, truth = make_leads(size // 2)
+        rows, truth = rows[:size], truth[:size]
+        start = time.perf_counter()
+        groups = resolver.clusters(rows)
+        elapsed = time.perf_counter() - start
+        precision, recall = pair_scores(groups, truth)
+        print(
+            f"{len(rows):7d} rows -> {len(groups):7d} entities (true {len(set(truth)):7d})  "
+            f"{elapsed:6.2f} s  {elapsed / len(rows) * 1e6:5.1f} us/row  "
+            f"precision {precision:.3f}  recall {recall:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
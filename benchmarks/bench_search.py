@@ -0,0 +1,68 @@
+"""Time the lead table filters: the per-filter scan ScraperApp used to do against LeadIndex.
+
+Usage: python -m benchmarks.bench_search [--rows 100000]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.bench_resolution import make_leads
+from lead_scraper.search_index import LeadIndex
+from lead_scraper.utils import is_business_email
+
+QUERIES = [("plumbing", "", False), ("lake rd", "", False), ("555", "", False), ("", ".com", True), ("joe", "", True), ("zzzq", "", False)]
+
+
+def with_emails(rows: List[Dict[str, str]], seed: int = 7) -> List[Dict[str, str]]:
+    rnd = random.Random(seed)
+    for r in rows:
+        local = r["name"].split()[0].lower().replace("'", "")
+        r["email"] = rnd.choice(["", f"{local}@gmail.com", f"info@{local}.com", f"{local}@yahoo.com, sales@{local}.com"])
+    return rows
+
+
+# Previous implementation from main_tk.py (apply_filter plus the insert-time filters)
+def legacy_filter(rows: List[Dict[str, str]], query: str, domain: str, business_email: bool) -> List[int]:
+    out = []
+    for i, r in enumerate(rows):
+        if domain and domain not in (r.get("website") or "").lower():
+            continue
+        if business_email:
+            emails = [e.strip() for e in (r.get("email") or "").split(",") if e.strip()]
+            if emails and not any(is_business_email(e) for e in emails):
+                continue
+        if query:
+            hay = " ".join([r.get("name", ""), r.get("website", ""), r.get("email", ""), r.get("phone", ""), r.get("address", "")]).lower()
+            if query not in hay:
+                continue
+        out.append(i)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+    rows, _ = make_leads(args.rows // 2)
+    rows = with_emails(rows[:args.rows])
+
+    index = LeadIndex()
+    start = time.perf_counter()
+    index.add(rows)
+    print(f"{len(rows)} rows indexed in {time.perf_counter() - start:.2f} s")
+    for query, domain, business in QUERIES:
+        start = time.perf_counter()
+        old = legacy_filter(rows, query, domain, business)
+        scan = time.perf_counter() - start
+        start = time.perf_counter()
+        new = index.search(query, domain, business)
+        fast = time.perf_counter() - start
+        label = f"text={query!r} domain={domain!r} business_email={business}"
+        print(f"  {label:50s} {len(new):6d} hits  scan {scan * 1000:7.1f} ms  index {fast * 1000:6.1f} ms  same: {old == new}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .utils import lead_key, logger
+
+
+class DedupIndex:
+    """Persistent set of lead keys, so leads seen in earlier runs can be skipped.
+
+    Keys are `utils.lead_key` hashes stored in a SQLite table. Lookups and inserts
+    are batched, and rows can be streamed through `filter_new`. With `ttl` set, a
+    lead seen longer ago than that counts as new again and is re-enriched.
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "leads_seen.db"), ttl: Optional[float] = None, batch_size: int = 500) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS seen (key BLOB PRIMARY KEY, first_seen REAL NOT NULL, last_seen REAL NOT NULL) WITHOUT ROWID"
+        )
+        self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def _known(self, keys: List[bytes]) -> set:
+        # Caller holds the lock
+        cutoff = time.time() - self.ttl if self.ttl else 0.0
+        known = set()
+        for i in range(0, len(keys), 900):  # stay under SQLite's bound-parameter limit
+            chunk = keys[i:i + 900]
+            marks = ",".join("?" * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key FROM seen WHERE last_seen >= ? AND key IN ({marks})", [cutoff, *chunk]
+            )
+            known.update(k for (k,) in rows)
+        return known
+
+    def _insert(self, keys: Iterable[bytes]) -> None:
+        # Caller holds the lock
+        now = time.time()
+        self._db.executemany(
+            "INSERT INTO seen (key, first_seen, last_seen) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET last_seen = excluded.last_seen",
+            [(k, now, now) for k in keys],
+        )
+        self._db.commit()
+
+    def contains(self, row: Dict[str, str]) -> bool:
+        with self._lock:
+            return bool(self._known([lead_key(row)]))
+
+    def add(self, rows: Iterable[Dict[str, str]]) -> None:
+        with self._lock:
+            self._insert({lead_key(r) for r in rows})
+
+    def add_keys(self, keys: Iterable[bytes]) -> None:
+        """Record `lead_key`s taken earlier, e.g. before enrichment changed the rows' phones."""
+        with self._lock:
+            self._insert(set(keys))
+
+    def filter_new(self, rows: Iterable[Dict[str, str]], record: bool = True) -> Iterator[Dict[str, str]]:
+        """Yield the rows whose key is not in the index, recording them as seen unless `record` is False.
+
+        Rows are checked in batches of `batch_size`, and duplicates within the stream
+        are dropped too, so this also replaces an in-memory dedup pass.
+        """
+        batch: List[Dict[str, str]] = []
+        emitted: set = set()
+        skipped = 0
+
+        def flush() -> Iterator[Dict[str, str]]:
+            nonlocal skipped
+            keyed = [(lead_key(r), r) for r in batch]
+            with self._lock:
+                known = self._known(list({k for k, _ in keyed}))
+                fresh = []
+                for key, row in keyed:
+                    if key in known or key in emitted:
+                        skipped += 1
+                        continue
+                    emitted.add(key)
+                    fresh.append((key, row))
+                if record and fresh:
+                    self._insert(k for k, _ in fresh)
+            batch.clear()
+            for _, row in fresh:
+                yield row
+
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                yield from flush()
+        if batch:
+            yield from flush()
+        if skipped:
+            logger.info(f"Dedup index: skipped {skipped} leads already seen")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM seen")
+            self._db.commit()
+
+
+_default_index: Optional[DedupIndex] = None
+_default_lock = threading.Lock()
+
+
+def default_dedup_index() -> DedupIndex:
+    """Process-wide index shared by the desktop and web apps."""
+    global _default_index
+    with _default_lock:
+        if _default_index is None:
+            _default_index = DedupIndex()
+            logger.info(f"Dedup index at {_default_index.path}")
+        return _default_index
@@ -1,25 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-import re
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 import tldextract
 
-from .utils import validate_email, normalize_phone, logger
-
-EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
-PHONE_PATTERN = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
-SOCIAL_DOMAINS = [
-    "facebook.com",
-    "instagram.com",
-    "twitter.com",
-    "x.com",
-    "linkedin.com",
-    "t.me",
-    "youtube.com",
-]
+from .extract import extract_contacts
+from .http_cache import ResponseCache
+from .http_client import ClientSettings, HostSlots, build_async_client
+from .ratelimit import RATE_LIMITER, RateLimiter, rate_for_delay
+from .utils import logger
 
 
 def _absolutize(base_url: str, path: str) -> str:
@@ -31,10 +22,23 @@ def _absolutize(base_url: str, path: str) -> str:
     return base + path
 
 
-async def _fetch(client: httpx.AsyncClient, url: str) -> Optional[str]:
+async def _fetch(
+    client: httpx.AsyncClient,
+    url: str,
+    limiter: RateLimiter = RATE_LIMITER,
+    rate: Optional[float] = None,
+    cache: ResponseCache | None = None,
+    burst: int = 1,
+) -> Optional[str]:
     try:
         logger.info(f"Enrich fetch: {url}")
-        resp = await client.get(url, timeout=15)
+        if cache is not None:
+            resp = await cache.fetch_async(
+                client, url, throttle=lambda: limiter.acquire_async(url, rate=rate, burst=burst)
+            )
+        else:
+            await limiter.acquire_async(url, rate=rate, burst=burst)
+            resp = await client.get(url)
         if resp.status_code >= 400:
             logger.error(f"Enrich HTTP {resp.status_code} for {url}")
             return None
@@ -47,82 +51,184 @@ async def _fetch(client: httpx.AsyncClient, url: str) -> Optional[str]:
         return None
 
 
-def _extract_emails(text: str) -> List[str]:
-    found = []
-    for match in EMAIL_PATTERN.findall(text or ""):
-        if validate_email(match):
-            found.append(match)
-    # dedupe preserving order
-    return list(dict.fromkeys(found))
-
-
-def _extract_phones(text: str) -> List[str]:
-    found = set()
-    for match in PHONE_PATTERN.findall(text or ""):
-        normalized = normalize_phone(match)
-        if len(normalized) >= 7:
-            found.add(normalized)
-    return list(found)
-
-
-def _extract_socials(text: str) -> List[str]:
-    urls = set()
-    for domain in SOCIAL_DOMAINS:
-        pattern = re.compile(rf"https?://(?:www\.)?{re.escape(domain)}[^\s'\"]+", re.IGNORECASE)
-        for u in pattern.findall(text or ""):
-            urls.add(u)
-    return list(urls)
-
-
-async def enrich_with_website_details(rows: List[Dict[str, str]], concurrency: int = 10, delay_seconds: float = 0.0) -> List[Dict[str, str]]:
-    semaphore = asyncio.Semaphore(max(1, concurrency))
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36",
-        "Accept-Language": "en-US,en;q=0.9",
-    }
-
-    async with httpx.AsyncClient(headers=headers, follow_redirects=True) as client:
-        async def process(row: Dict[str, str]) -> Dict[str, str]:
-            website = (row.get("website") or "").strip()
-            if not website:
-                return row
-            async with semaphore:
-                html = await _fetch(client, website)
-                if delay_seconds:
-                    await asyncio.sleep(delay_seconds)
-                if not html:
-                    return row
-
-                domain = tldextract.extract(website)
-                root = f"https://{domain.registered_domain}" if domain.registered_domain else website
-                candidate_paths = ["/contact", "/contact-us", "/about", "/about-us"]
-
-                emails = _extract_emails(html)
-                phones = _extract_phones(html)
-                socials = _extract_socials(html)
-
-                for p in candidate_paths:
-                    contact_url = _absolutize(root, p)
-                    extra = await _fetch(client, contact_url)
-                    if delay_seconds:
-                        await asyncio.sleep(delay_seconds)
-                    if not extra:
-                        continue
-                    emails.extend(_extract_emails(extra))
-                    phones.extend(_extract_phones(extra))
-                    socials.extend(_extract_socials(extra))
-
-                emails = list(dict.fromkeys(emails))
-                phones = list(dict.fromkeys(phones))
-                socials = list(dict.fromkeys(socials))
-
-                if emails and not row.get("email"):
-                    row["email"] = ", ".join(emails[:3])
-                if phones and not row.get("phone"):
-                    row["phone"] = ", ".join(phones[:3])
-                if socials:
-                    row["socials"] = ", ".join(socials[:5])
-                return row
-
-        return await asyncio.gather(*[process(dict(r)) for r in rows])
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+CANDIDATE_PATHS = ["/contact", "/contact-us", "/about", "/about-us"]
+
+
+class _Enricher:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        limiter: RateLimiter,
+        rate: float,
+        cache: ResponseCache | None,
+        per_host: int,
+    ) -> None:
+        self.client = client
+        self.limiter = limiter
+        self.rate = rate
+        self.cache = cache
+        self.per_host = per_host
+        self.host_slots = HostSlots(per_host)
+
+    async def fetch(self, url: str) -> Optional[str]:
+        return await _fetch(self.client, url, self.limiter, self.rate, self.cache, burst=self.per_host)
+
+    async def enrich(self, row: Dict[str, str]) -> Dict[str, str]:
+        """Probe the homepage and contact pages at once, stopping when nothing is left to find."""
+        website = (row.get("website") or "").strip()
+        if not website:
+            return row
+
+        domain = tldextract.extract(website)
+        root = f"https://{domain.registered_domain}" if domain.registered_domain else website
+        urls = list(dict.fromkeys([website] + [_absolutize(root, p) for p in CANDIDATE_PATHS]))
+
+        async def probe(url: str):
+            # Shared per-host slots also cover other leads that point at the same host
+            async with self.host_slots.hold(url):
+                html = await self.fetch(url)
+            if not html:
+                return url, None
+            return url, extract_contacts(html)
+
+        found: Dict[str, Tuple[List[str], List[str], List[str]]] = {}
+        has_email, has_phone, has_socials = bool(row.get("email")), bool(row.get("phone")), False
+        tasks = [asyncio.create_task(probe(u)) for u in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                url, extracted = await next_done
+                if not extracted:
+                    continue
+                found[url] = extracted
+                has_email = has_email or bool(extracted[0])
+                has_phone = has_phone or bool(extracted[1])
+                has_socials = has_socials or bool(extracted[2])
+                if has_email and has_phone and has_socials:
+                    break
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for t in pending:
+                t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # Merge in probe order so the result does not depend on which page answered first
+        emails: List[str] = []
+        phones: List[str] = []
+        socials: List[str] = []
+        for url in urls:
+            if url in found:
+                emails.extend(found[url][0])
+                phones.extend(found[url][1])
+                socials.extend(found[url][2])
+
+        emails = list(dict.fromkeys(emails))
+        phones = list(dict.fromkeys(phones))
+        socials = list(dict.fromkeys(socials))
+
+        if emails and not row.get("email"):
+            row["email"] = ", ".join(emails[:3])
+        if phones and not row.get("phone"):
+            row["phone"] = ", ".join(phones[:3])
+        if socials:
+            row["socials"] = ", ".join(socials[:5])
+        return row
+
+
+async def _iter_enriched_indexed(
+    rows: Iterable[Dict[str, str]],
+    concurrency: int = 10,
+    delay_seconds: float = 0.0,
+    rate_limiter: RateLimiter | None = None,
+    cache: ResponseCache | None = None,
+    client_settings: ClientSettings | None = None,
+) -> AsyncIterator[Tuple[int, Dict[str, str]]]:
+    workers = max(1, concurrency)
+    # delay_seconds is the per-site request interval for hosts without a configured budget
+    rate = rate_for_delay(delay_seconds)
+    # Bounded queues keep memory flat: the feeder only runs a couple of rows ahead of the workers
+    todo: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+    done: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+
+    settings = client_settings or ClientSettings()
+    async with build_async_client(settings, headers=DEFAULT_HEADERS) as client:
+        enricher = _Enricher(client, rate_limiter or RATE_LIMITER, rate, cache, settings.per_host_connections)
+
+        async def feed() -> None:
+            try:
+                for idx, row in enumerate(rows):
+                    await todo.put((idx, row))
+            except Exception as e:
+                logger.exception(f"Enrich: reading rows failed: {e}")
+            # Not in a finally: a cancelled feeder would block on the full queue, and the
+            # workers it would stop are cancelled along with it
+            for _ in range(workers):
+                await todo.put(None)
+
+        async def work() -> None:
+            while True:
+                item = await todo.get()
+                if item is None:
+                    await done.put(None)
+                    return
+                idx, row = item
+                try:
+                    enriched = await enricher.enrich(dict(row))
+                except Exception as e:
+                    logger.exception(f"Enrich failed for {row.get('website')}: {e}")
+                    enriched = dict(row)
+                await done.put((idx, enriched))
+
+        tasks = [asyncio.create_task(feed())] + [asyncio.create_task(work()) for _ in range(workers)]
+        try:
+            finished = 0
+            while finished < workers:
+                item = await done.get()
+                if item is None:
+                    finished += 1
+                    continue
+                yield item
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def iter_enriched(
+    rows: Iterable[Dict[str, str]],
+    concurrency: int = 10,
+    delay_seconds: float = 0.0,
+    rate_limiter: RateLimiter | None = None,
+    cache: ResponseCache | None = None,
+    client_settings: ClientSettings | None = None,
+) -> AsyncIterator[Dict[str, str]]:
+    """Yield enriched copies of `rows` in completion order.
+
+    `concurrency` workers pull rows from a bounded queue, so rows are consumed lazily
+    from `rows` and at most a few are held in memory at any time. Connection pool size,
+    per-host limits, HTTP/2 and timeouts come from `client_settings`.
+    """
+    indexed = _iter_enriched_indexed(rows, concurrency, delay_seconds, rate_limiter, cache, client_settings)
+    try:
+        async for _, row in indexed:
+            yield row
+    finally:
+        # A consumer that stops early closes this generator; pass that on so the workers are cancelled
+        await indexed.aclose()
+
+
+async def enrich_with_website_details(
+    rows: List[Dict[str, str]],
+    concurrency: int = 10,
+    delay_seconds: float = 0.0,
+    rate_limiter: RateLimiter | None = None,
+    cache: ResponseCache | None = None,
+    client_settings: ClientSettings | None = None,
+) -> List[Dict[str, str]]:
+    results: List[Dict[str, str]] = [{} for _ in rows]
+    async for idx, row in _iter_enriched_indexed(rows, concurrency, delay_seconds, rate_limiter, cache, client_settings):
+        results[idx] = row
+    return results
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from .utils import logger
+
+
+def source_name(scraper: object) -> str:
+    return getattr(scraper, "name", type(scraper).__name__)
+
+
+def uses_browser(scraper: object) -> bool:
+    return bool(getattr(scraper, "uses_browser", False))
+
+
+class SourceExecutor:
+    """Runs independent sources at the same time and streams their rows back.
+
+    Browser-backed sources (those with `uses_browser = True`) run on their own small
+    pool so a few Chrome instances cannot starve, or be starved by, the cheaper
+    requests-backed sources. Results are yielded as each source finishes, so a run
+    takes about as long as its slowest source.
+
+    `stop_flag` only keeps queued sources from starting; `run_source` should hand it
+    to the scraper so a running source stops at its next page.
+    """
+
+    def __init__(self, browser_workers: int = 2, http_workers: int = 4) -> None:
+        self.browser_workers = max(1, browser_workers)
+        self.http_workers = max(1, http_workers)
+
+    def stream(
+        self,
+        scrapers: Iterable[object],
+        run_source: Callable[[object], List[Dict[str, str]]],
+        stop_flag: Callable[[], bool] | None = None,
+    ) -> Iterator[Tuple[object, List[Dict[str, str]]]]:
+        def run(scraper: object) -> List[Dict[str, str]]:
+            if stop_flag and stop_flag():
+                return []
+            logger.info(f"Source started: {source_name(scraper)}")
+            return run_source(scraper) or []
+
+        with ThreadPoolExecutor(max_workers=self.browser_workers, thread_name_prefix="browser-src") as browser_pool, \
+                ThreadPoolExecutor(max_workers=self.http_workers, thread_name_prefix="http-src") as http_pool:
+            futures = {}
+            for scraper in scrapers:
+                pool = browser_pool if uses_browser(scraper) else http_pool
+                futures[pool.submit(run, scraper)] = scraper
+            for fut in as_completed(futures):
+                scraper = futures[fut]
+                try:
+                    rows = fut.result()
+                except Exception as e:
+                    logger.exception(f"Source {source_name(scraper)} failed: {e}")
+                    rows = []
+                logger.info(f"Source finished: {source_name(scraper)} ({len(rows)} rows)")
+                yield scraper, rows
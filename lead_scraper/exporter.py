@@ -1,7 +1,20 @@
 from __future__ import annotations
 
-from typing import Dict, List
-import pandas as pd
+import csv
+import io
+import itertools
+import json
+import os
+from typing import Callable, Dict, Iterable, Iterator, List
+
+from .records import LeadRecords
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for Parquet export
+    pa = None
+    pq = None
 
 EXPORT_COLUMNS = [
     "name",
@@ -15,48 +28,136 @@ EXPORT_COLUMNS = [
     "status",
     "notes",
 ]
+CHUNK_ROWS = 10000
+# Worksheet rows including the header; further rows continue on a new sheet
+EXCEL_MAX_ROWS = 1048576
+
+
+def _cell(value) -> object:
+    return "" if value is None else value
+
+
+def iter_export_rows(rows: Iterable[Dict[str, str]]) -> Iterator[List[object]]:
+    """Each row as a list of values in EXPORT_COLUMNS order, missing fields as ""."""
+    for r in rows:
+        yield [_cell(r.get(col)) for col in EXPORT_COLUMNS]
+
+
+def _chunks(rows: Iterable[Dict[str, str]], size: int) -> Iterator[List[List[object]]]:
+    it = iter_export_rows(rows)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_csv(rows: Iterable[Dict[str, str]], chunk_size: int = 1000, lineterminator: str = os.linesep) -> Iterator[str]:
+    """CSV text in pieces of `chunk_size` rows, header first, e.g. for a streamed response."""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator=lineterminator)
+    writer.writerow(EXPORT_COLUMNS)
+    for chunk in _chunks(rows, chunk_size):
+        writer.writerows(chunk)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
+
+
+def iter_jsonl(rows: Iterable[Dict[str, str]], chunk_size: int = 1000) -> Iterator[str]:
+    """JSON Lines text in pieces of `chunk_size` rows."""
+    for chunk in _chunks(rows, chunk_size):
+        yield "".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False, default=str) + "\n" for values in chunk
+        )
+
+
+def export_to_csv(rows: Iterable[Dict[str, str]], path: str, chunk_size: int = CHUNK_ROWS) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as fh:
+        writer = csv.writer(fh, lineterminator=os.linesep)
+        writer.writerow(EXPORT_COLUMNS)
+        for chunk in _chunks(rows, chunk_size):
+            writer.writerows(chunk)
+            count += len(chunk)
+    return count
+
+
+def export_to_excel(rows: Iterable[Dict[str, str]], path: str) -> int:
+    # Write-only workbooks stream rows to disk instead of keeping every cell object
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = None
+    sheet_rows = EXCEL_MAX_ROWS
+    count = 0
+    for values in iter_export_rows(rows):
+        if sheet_rows >= EXCEL_MAX_ROWS:
+            ws = wb.create_sheet("Leads" if ws is None else f"Leads {len(wb.worksheets) + 1}")
+            ws.append(EXPORT_COLUMNS)
+            sheet_rows = 1
+        ws.append(values)
+        sheet_rows += 1
+        count += 1
+    if ws is None:
+        wb.create_sheet("Leads").append(EXPORT_COLUMNS)
+    wb.save(path)
+    return count
+
+
+def export_to_jsonl(rows: Iterable[Dict[str, str]], path: str) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as fh:
+        for values in iter_export_rows(rows):
+            fh.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False, default=str))
+            fh.write("\n")
+            count += 1
+    return count
+
+
+def _score(value) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def export_to_parquet(rows: Iterable[Dict[str, str]], path: str, chunk_size: int = 50000) -> int:
+    """Parquet with one row group per chunk; needs the optional `pyarrow` package."""
+    if pa is None:
+        raise ImportError("Parquet export needs the 'pyarrow' package")
+    schema = pa.schema([(col, pa.int64() if col == "score" else pa.string()) for col in EXPORT_COLUMNS])
+    score_at = EXPORT_COLUMNS.index("score")
+    count = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for chunk in _chunks(rows, chunk_size):
+            columns = [
+                [_score(v[i]) for v in chunk] if i == score_at else [str(v[i]) for v in chunk]
+                for i in range(len(EXPORT_COLUMNS))
+            ]
+            writer.write_table(pa.Table.from_arrays([pa.array(c, type=f.type) for c, f in zip(columns, schema)], schema=schema))
+            count += len(chunk)
+    return count
+
+
+EXPORTERS: Dict[str, Callable[[Iterable[Dict[str, str]], str], int]] = {
+    ".csv": export_to_csv,
+    ".xlsx": export_to_excel,
+    ".jsonl": export_to_jsonl,
+    ".parquet": export_to_parquet,
+}
+
+
+def export_to_path(rows: Iterable[Dict[str, str]], path: str) -> int:
+    """Export with the writer matching the file extension; returns the row count."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORTERS:
+        raise ValueError(f"Unsupported export format {ext!r}; use one of {', '.join(EXPORTERS)}")
+    return EXPORTERS[ext](rows, path)
 
 
-def export_to_csv(rows: List[Dict[str, str]], path: str) -> None:
-    df = pd.DataFrame(rows)
-    for col in EXPORT_COLUMNS:
-        if col not in df.columns:
-            df[col] = ""
-    df = df[EXPORT_COLUMNS]
-    df.to_csv(path, index=False, encoding="utf-8-sig")
-
-
-def export_to_excel(rows: List[Dict[str, str]], path: str) -> None:
-    df = pd.DataFrame(rows)
-    for col in EXPORT_COLUMNS:
-        if col not in df.columns:
-            df[col] = ""
-    df = df[EXPORT_COLUMNS]
-    df.to_excel(path, index=False)
-
-
-def export_selected(treeview, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    selected = []
-    for item in treeview.selection():
-        values = treeview.item(item, "values")
-        # Map the columns by our table order in the UI
-        row = {
-            "name": values[0],
-            "website": values[1],
-            "email": values[2],
-            "phone": values[3],
-            "address": values[4],
-            "socials": values[5] if len(values) > 5 else "",
-        }
-        # backfill extra fields if available in full row store
-        for r in rows:
-            if r.get("name") == row["name"] and r.get("website") == row["website"]:
-                row.update({
-                    "source": r.get("source", ""),
-                    "score": r.get("score", ""),
-                    "status": r.get("status", ""),
-                    "notes": r.get("notes", ""),
-                })
-                break
-        selected.append(row)
-    return selected
+def export_selected(ids: Iterable[str], records: LeadRecords) -> List[Dict[str, str]]:
+    """The export columns of the selected leads, looked up by id."""
+    return [{col: r.get(col, "") for col in EXPORT_COLUMNS} for r in records.rows(ids)]
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import re
+from typing import List, Tuple
+
+from .utils import normalize_phone
+
+SOCIAL_DOMAINS = [
+    "facebook.com",
+    "instagram.com",
+    "twitter.com",
+    "x.com",
+    "linkedin.com",
+    "t.me",
+    "youtube.com",
+]
+
+_EMAIL_BLOCKLIST = ("example.com", "test@", "no-reply", "noreply")
+_EMAIL_SHAPE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_LOCAL_CHARS = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789._%+-")
+_PHONE_STRIP = str.maketrans("", "", " \t\n\r\f\v().-")
+
+# Every branch starts on ':', '@', '+' or a digit, so the regex engine can skip all
+# other characters with its prefix check instead of trying each branch at every
+# position. Anything that needs context before that character (the http(s) scheme,
+# mailto:, tel:) is checked with a fixed-width lookbehind, and the local part of a
+# bare email is recovered by walking back from the '@'. Branch order matters where
+# matches overlap: social URLs and mailto:/tel: links are consumed whole before the
+# email and phone branches can match pieces of them. A tel: number uses the same
+# pattern as a bare phone, so "tel:+1 (555) 123-4567" keeps its country code.
+CONTACT_PATTERN = re.compile(
+    r"""
+    [:@+0-9]
+    (?:
+        (?<=:)
+        (?:
+            (?:(?<=[Hh][Tt][Tt][Pp]:)|(?<=[Hh][Tt][Tt][Pp][Ss]:))
+            //(?P<social>(?i:(?:www\.)?(?:%s))[^\s'"]+)
+          | (?<=mailto:)(?P<mailto>[^\s'"<>?&]+)
+          | (?<=tel:)(?P<tel>\+?\d[\d\s().-]{7,}\d)
+        )
+      | (?<=@)(?P<domain>[A-Za-z0-9.-]+\.[A-Za-z]{2,})
+      | (?:(?<=\+)\d)?(?<=\d)[\d\s().-]{7,}\d
+    )
+    """ % "|".join(re.escape(d) for d in SOCIAL_DOMAINS),
+    re.VERBOSE,
+)
+
+
+def _usable_email(email: str) -> bool:
+    # Same rules as utils.validate_email once the shape is known to be valid
+    return len(email) <= 254 and not any(x in email for x in _EMAIL_BLOCKLIST)
+
+
+def _phone(value: str) -> str:
+    digits = value.translate(_PHONE_STRIP)
+    if not (digits.isascii() and digits.lstrip("+").isdigit()):
+        # Unicode spaces or digits: fall back to the general normaliser
+        return normalize_phone(value)
+    return digits[:20]
+
+
+def extract_contacts(text: str) -> Tuple[List[str], List[str], List[str]]:
+    """Return (emails, phones, socials) found in one pass over `text`, in first-seen order."""
+    text = text or ""
+    emails: dict = {}
+    phones: dict = {}
+    socials: dict = {}
+    for m in CONTACT_PATTERN.finditer(text):
+        kind = m.lastgroup
+        if kind is None:
+            phone = _phone(m.group())
+            if len(phone) >= 7:
+                phones[phone] = None
+        elif kind == "domain":
+            at = start = m.start()
+            floor = max(0, at - 254)
+            while start > floor and text[start - 1] in _LOCAL_CHARS:
+                start -= 1
+            if start < at:
+                email = text[start:m.end()]
+                if _usable_email(email):
+                    emails[email] = None
+        elif kind == "social":
+            scheme_len = 5 if text[m.start() - 1] in "sS" else 4
+            socials[text[m.start() - scheme_len:m.end()]] = None
+        elif kind == "mailto":
+            email = m.group("mailto")
+            if _EMAIL_SHAPE.fullmatch(email) and _usable_email(email):
+                emails[email] = None
+        elif kind == "tel":
+            phone = _phone(m.group("tel"))
+            if len(phone) >= 7:
+                phones[phone] = None
+    return list(emails), list(phones), list(socials)
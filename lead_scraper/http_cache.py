@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+import requests
+
+from .utils import logger
+
+# Response headers worth keeping alongside a cached body
+_KEPT_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+
+
+class CachedResponse:
+    """Minimal response object shared by the requests and httpx code paths."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int,
+        headers: Dict[str, str],
+        content: bytes,
+        encoding: Optional[str] = None,
+        from_cache: bool = False,
+    ) -> None:
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.encoding = encoding or "utf-8"
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+
+def _kept_headers(headers) -> Dict[str, str]:
+    return {k: headers[k] for k in _KEPT_HEADERS if headers.get(k)}
+
+
+class ResponseCache:
+    """Persistent HTTP GET cache with content-addressed bodies.
+
+    Bodies live under `objects/` named by their SHA-256, so identical pages fetched
+    from different URLs are stored once. A SQLite index maps each URL to its body,
+    validators and expiry. Stale entries are revalidated with If-None-Match /
+    If-Modified-Since and a 304 refreshes the entry without downloading the body
+    again. When the bodies exceed `max_bytes` the least recently used entries are
+    evicted.
+    """
+
+    def __init__(self, directory: str = os.path.join(".cache", "http"), ttl: float = 6 * 3600, max_bytes: int = 512 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                encoding TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+        self._db.commit()
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(f"GET {url}".encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "evictions": self.evictions,
+                "entries": count,
+                "bytes": self._total_bytes,
+            }
+
+    def _lookup(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, status, headers, encoding, stored_at, expires_at FROM entries WHERE key = ?",
+                (self._key(url),),
+            ).fetchone()
+        if not row:
+            return None
+        digest, status, headers, encoding, stored_at, expires_at = row
+        try:
+            with open(self._object_path(digest), "rb") as fh:
+                content = fh.read()
+        except OSError:
+            return None
+        return {
+            "status": status,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "stored_at": stored_at,
+            "expires_at": expires_at,
+            "content": content,
+        }
+
+    def _touch(self, url: str, refresh: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            if refresh:
+                self._db.execute(
+                    "UPDATE entries SET accessed_at = ?, expires_at = ? WHERE key = ?",
+                    (now, now + self.ttl, self._key(url)),
+                )
+            else:
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, self._key(url)))
+            self._db.commit()
+
+    def store(self, resp: CachedResponse) -> None:
+        if resp.status_code != 200 or "no-store" in resp.headers.get("cache-control", ""):
+            return
+        digest = hashlib.sha256(resp.content).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as fh:
+                fh.write(resp.content)
+            os.replace(tmp, path)
+        now = time.time()
+        key = self._key(resp.url)
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._total_bytes += len(resp.content) - (previous[0] if previous else 0)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, resp.url, digest, resp.status_code, json.dumps(resp.headers),
+                    resp.encoding, now, now + self.ttl, now, len(resp.content),
+                ),
+            )
+            self._db.commit()
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock. Evict down to 90% of the cap so eviction is not re-run on every store.
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        for key, digest, size in self._db.execute("SELECT key, digest, size FROM entries ORDER BY accessed_at").fetchall():
+            if self._total_bytes <= target:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            still_used = self._db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (digest,)).fetchone()
+            if not still_used:
+                try:
+                    os.remove(self._object_path(digest))
+                except OSError:
+                    pass
+            self._total_bytes -= size
+            self.evictions += 1
+        self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            digests = [d for (d,) in self._db.execute("SELECT DISTINCT digest FROM entries")]
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._total_bytes = 0
+        for digest in digests:
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+
+    @staticmethod
+    def _conditional_headers(entry: Dict) -> Dict[str, str]:
+        headers = {}
+        if entry["headers"].get("etag"):
+            headers["If-None-Match"] = entry["headers"]["etag"]
+        if entry["headers"].get("last-modified"):
+            headers["If-Modified-Since"] = entry["headers"]["last-modified"]
+        return headers
+
+    def _prepare(self, url: str):
+        """Return (fresh response or None, stale entry or None, extra request headers)."""
+        entry = self._lookup(url)
+        if entry and entry["expires_at"] > time.time():
+            self._count("hits")
+            self._touch(url)
+            return self._from_entry(url, entry), None, {}
+        if entry:
+            return None, entry, self._conditional_headers(entry)
+        return None, None, {}
+
+    def _finish(self, url: str, entry: Optional[Dict], resp: CachedResponse) -> CachedResponse:
+        if resp.status_code == 304 and entry:
+            self._count("revalidated")
+            self._touch(url, refresh=True)
+            return self._from_entry(url, entry)
+        self._count("misses")
+        self.store(resp)
+        return resp
+
+    @staticmethod
+    def _from_entry(url: str, entry: Dict) -> CachedResponse:
+        return CachedResponse(url, entry["status"], entry["headers"], entry["content"], entry["encoding"], from_cache=True)
+
+    def fetch(
+        self,
+        session: requests.Session,
+        url: str,
+        throttle: Callable[[], object] | None = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> CachedResponse:
+        """GET `url` through `session`, calling `throttle` only when the network is used."""
+        cached, entry, extra = self._prepare(url)
+        if cached is not None:
+            return cached
+        if throttle:
+            throttle()
+        resp = session.get(url, headers={**(headers or {}), **extra}, **kwargs)
+        live = CachedResponse(url, resp.status_code, _kept_headers(resp.headers), resp.content, resp.encoding or resp.apparent_encoding)
+        return self._finish(url, entry, live)
+
+    async def fetch_async(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        throttle: Callable[[], Awaitable[object]] | None = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs,
+    ) -> CachedResponse:
+        """Like `fetch`; the index lookup, file I/O and eviction run on a worker thread."""
+        cached, entry, extra = await asyncio.to_thread(self._prepare, url)
+        if cached is not None:
+            return cached
+        if throttle:
+            await throttle()
+        resp = await client.get(url, headers={**(headers or {}), **extra}, **kwargs)
+        live = CachedResponse(url, resp.status_code, _kept_headers(resp.headers), resp.content, resp.encoding)
+        return await asyncio.to_thread(self._finish, url, entry, live)
+
+
+_default_cache: Optional[ResponseCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> ResponseCache:
+    """Process-wide cache shared by the scrapers and the enrichment client."""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+            logger.info(f"HTTP cache at {_default_cache.directory}")
+        return _default_cache
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ipaddress
+import socket
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+from .ratelimit import host_key
+from .utils import logger
+
+
+class ClientSettings:
+    """Connection settings for the async enrichment client.
+
+    `max_connections` caps sockets across all hosts and `per_host_connections` caps
+    in-flight requests to any single host, so one slow site cannot hold every slot.
+    `http2` needs the optional `h2` package and falls back to HTTP/1.1 without it.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        per_host_connections: int = 5,
+        http2: bool = False,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 15.0,
+        pool_timeout: float = 10.0,
+        keepalive_expiry: float = 30.0,
+        dns_ttl: float = 300.0,
+    ) -> None:
+        self.max_connections = max(1, max_connections)
+        self.max_keepalive_connections = max(0, max_keepalive_connections)
+        self.per_host_connections = max(1, per_host_connections)
+        self.http2 = http2
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_timeout = pool_timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.dns_ttl = dns_ttl
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=min(self.max_keepalive_connections, self.max_connections),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.read_timeout,
+            pool=self.pool_timeout,
+        )
+
+
+class DNSCache:
+    """In-process cache of getaddrinfo results, shared by every connection of a client."""
+
+    def __init__(self, ttl: float = 300.0) -> None:
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        # Concurrent lookups for the same host share one resolver call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # this caller was cancelled
+                # The caller doing the lookup was cancelled; do it here instead
+                return await self.resolve(host, port)
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+            self._entries[key] = (time.monotonic() + self.ttl, addresses)
+            fut.set_result(addresses)
+            return addresses
+        except Exception as e:
+            fut.set_exception(e)
+            # Mark retrieved so asyncio does not warn when nobody else was waiting
+            fut.exception()
+            raise
+        finally:
+            del self._inflight[key]
+            # Cancelled (BaseException) before a result: release the callers waiting on it
+            if not fut.done():
+                fut.cancel()
+
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """Resolves hostnames through a DNSCache before connecting.
+
+    httpcore still passes the original hostname for TLS SNI and certificate checks,
+    so connecting to the resolved address is transparent to the request.
+    """
+
+    def __init__(self, dns: DNSCache) -> None:
+        self.dns = dns
+        self._backend = httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            ipaddress.ip_address(host)
+            addresses = [host]
+        except ValueError:
+            addresses = await self.dns.resolve(host, port)
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error or httpcore.ConnectError(f"No addresses for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class _PooledTransport(httpx.AsyncHTTPTransport):
+    def __init__(self, settings: ClientSettings, http2: bool, network_backend: httpcore.AsyncNetworkBackend) -> None:
+        limits = settings.limits()
+        super().__init__(limits=limits, http2=http2)
+        # httpx 0.27 has no hook for a custom network backend, so rebuild the pool with one
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(http2=http2),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_async_client(settings: ClientSettings | None = None, headers: Optional[Dict[str, str]] = None) -> httpx.AsyncClient:
+    settings = settings or ClientSettings()
+    http2 = settings.http2
+    if http2 and not _http2_available():
+        logger.warning("HTTP/2 requested but the 'h2' package is not installed, using HTTP/1.1")
+        http2 = False
+    transport = _PooledTransport(settings, http2, CachingNetworkBackend(DNSCache(settings.dns_ttl)))
+    return httpx.AsyncClient(
+        headers=headers,
+        follow_redirects=True,
+        timeout=settings.timeout(),
+        transport=transport,
+    )
+
+
+class HostSlots:
+    """Per-host semaphores that are dropped as soon as no request holds them."""
+
+    def __init__(self, per_host: int) -> None:
+        self.per_host = max(1, per_host)
+        self._slots: Dict[str, List] = {}
+
+    @contextlib.asynccontextmanager
+    async def hold(self, url: str) -> AsyncIterator[None]:
+        key = host_key(url)
+        entry = self._slots.get(key)
+        if entry is None:
+            entry = self._slots[key] = [asyncio.Semaphore(self.per_host), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._slots[key]
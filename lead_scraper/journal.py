@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .utils import lead_id, logger
+
+
+def _record(key: str, row: Dict[str, str]) -> bytes:
+    return (json.dumps({"id": key, "row": row}, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
+def _replay(path: str, limit: Optional[int] = None) -> Dict[str, Dict[str, str]]:
+    """Latest row per id from the first `limit` bytes of a journal, in first-seen order."""
+    live: Dict[str, Dict[str, str]] = {}
+    if not os.path.exists(path):
+        return live
+    pos = 0
+    bad = 0
+    with open(path, "rb") as fh:
+        for line in fh:
+            pos += len(line)
+            if limit is not None and pos > limit:
+                break
+            try:
+                rec = json.loads(line)
+                key = rec["id"]
+            except (ValueError, KeyError, TypeError):
+                # A crash mid-append leaves at most a torn last line
+                bad += 1
+                continue
+            if rec.get("deleted"):
+                live.pop(key, None)
+            else:
+                live[key] = rec["row"]
+    if bad:
+        logger.warning(f"Journal {path}: skipped {bad} unreadable records")
+    return live
+
+
+def _fsync_dir(path: str) -> None:
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:  # directories cannot be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def recover_journal(path: str) -> List[Dict[str, str]]:
+    """Rebuild the rows of the last run from its journal, e.g. after a crash."""
+    leftover = path + ".compact"
+    if os.path.exists(leftover):
+        # A compaction that did not reach os.replace; the journal itself is complete
+        os.remove(leftover)
+    return list(_replay(path).values())
+
+
+class LeadJournal:
+    """Append-only autosave for the rows of the current run.
+
+    Each line is a JSON record `{"id": ..., "row": {...}}`; a later record for an id
+    replaces the earlier one and `{"id": ..., "deleted": true}` drops it. Only rows
+    that are new or changed since they were last written are appended. Every write
+    is flushed to the OS, so a crash of the app loses nothing. fsync runs every
+    `fsync_every` records or `fsync_interval` seconds, which bounds the loss if the
+    machine itself goes down. Once the file holds `compact_ratio` times more records
+    than live rows, a background thread rewrites it to one record per row.
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.join(".autosave", "leads_journal.jsonl"),
+        fsync_every: int = 200,
+        fsync_interval: float = 2.0,
+        compact_min: int = 1000,
+        compact_ratio: float = 2.0,
+    ) -> None:
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self.compact_min = compact_min
+        self.compact_ratio = compact_ratio
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._fh = None
+        self._digests: Dict[str, int] = {}
+        self._records = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._generation = 0
+        self._compactor: threading.Thread | None = None
+
+    def _open(self):
+        # Caller holds the lock
+        if self._fh is None:
+            self._fh = open(self.path, "ab")
+        return self._fh
+
+    def reset(self) -> None:
+        """Start an empty journal for a new run."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+            self._fh = open(self.path, "wb")
+            self._digests.clear()
+            self._records = 0
+            self._unsynced = 0
+            self._generation += 1
+
+    def write(self, rows: Iterable[Dict[str, str]]) -> int:
+        """Append the rows that are new or changed; returns how many were written."""
+        written = 0
+        with self._lock:
+            fh = self._open()
+            for row in rows:
+                key = lead_id(row)
+                line = _record(key, row)
+                digest = hash(line)
+                if self._digests.get(key) == digest:
+                    continue
+                self._digests[key] = digest
+                fh.write(line)
+                written += 1
+            if written:
+                self._appended(written)
+        return written
+
+    def retain(self, rows: Iterable[Dict[str, str]]) -> int:
+        """Drop every journaled row that is not in `rows`, e.g. after merging duplicates."""
+        keep = {lead_id(r) for r in rows}
+        with self._lock:
+            gone = [k for k in self._digests if k not in keep]
+            if not gone:
+                return 0
+            fh = self._open()
+            for key in gone:
+                del self._digests[key]
+                fh.write((json.dumps({"id": key, "deleted": True}) + "\n").encode("utf-8"))
+            self._appended(len(gone))
+        return len(gone)
+
+    def _appended(self, count: int) -> None:
+        # Caller holds the lock
+        self._fh.flush()
+        self._records += count
+        self._unsynced += count
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self._sync()
+        if (
+            self._records >= self.compact_min
+            and self._records > self.compact_ratio * max(1, len(self._digests))
+            and self._compactor is None
+        ):
+            self._compactor = threading.Thread(target=self._compact, name="journal-compact", daemon=True)
+            self._compactor.start()
+
+    def _sync(self) -> None:
+        # Caller holds the lock
+        if self._fh is not None and self._unsynced:
+            os.fsync(self._fh.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+            self._sync()
+
+    def _compact(self) -> None:
+        """Rewrite the journal to its live rows without blocking writers.
+
+        The prefix written so far is replayed and rewritten outside the lock. Only the
+        final step, copying records appended meanwhile and swapping the files, holds it.
+        """
+        tmp = self.path + ".compact"
+        try:
+            with self._lock:
+                self._fh.flush()
+                offset = self._fh.tell()
+                generation = self._generation
+            live = _replay(self.path, limit=offset)
+            with open(tmp, "wb") as out:
+                for key, row in live.items():
+                    out.write(_record(key, row))
+                with self._lock:
+                    if generation != self._generation:
+                        return  # reset() started a new run meanwhile
+                    self._fh.flush()
+                    with open(self.path, "rb") as src:
+                        src.seek(offset)
+                        tail = src.read()
+                    out.write(tail)
+                    out.flush()
+                    os.fsync(out.fileno())
+                    out.close()
+                    self._fh.close()
+                    os.replace(tmp, self.path)
+                    _fsync_dir(self.path)
+                    self._fh = open(self.path, "ab")
+                    before = self._records
+                    self._records = len(live) + tail.count(b"\n")
+                    self._unsynced = 0
+            logger.info(f"Compacted journal {self.path}: {before} -> {self._records} records")
+        except OSError as e:
+            logger.warning(f"Journal compaction failed: {e}")
+        finally:
+            if os.path.exists(tmp):
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+            self._compactor = None
+
+    def compact(self) -> None:
+        """Compact now and wait for it to finish."""
+        with self._lock:
+            busy = self._compactor
+            if busy is None and self._fh is not None:
+                busy = self._compactor = threading.Thread(target=self._compact, name="journal-compact", daemon=True)
+                busy.start()
+        if busy is not None:
+            busy.join()
+
+    def discard(self) -> None:
+        """Drop the journal once its rows are safely stored elsewhere, e.g. after a finished run.
+
+        Recovery only offers what a run left behind when it did not finish.
+        """
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._digests.clear()
+            self._records = 0
+            self._unsynced = 0
+            self._generation += 1
+
+    def close(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+                self._sync()
+                self._fh.close()
+                self._fh = None
@@ -2,8 +2,7 @@ import asyncio
 import threading
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from typing import List, Dict
-import os
+from typing import Dict, Iterable, List
 import logging
 
 from .sources.yellowpages import YellowPagesScraper
@@ -11,9 +10,23 @@ from .sources.yelp import YelpScraper
 from .sources.yelp_selenium import YelpSeleniumScraper
 from .sources.google_maps import GoogleMapsScraper
 from .sources.generic_html import GenericHTMLScraper
-from .sources.generic_selenium import GenericSeleniumScraper
-from .exporter import export_to_csv, export_to_excel, export_selected
-from .utils import deduplicate_records, score_lead, logger, is_business_email
+from .sources.generic_selenium import DEFAULT_CARD_SPEC, GenericSeleniumScraper
+from .dedup_index import default_dedup_index
+from .executor import SourceExecutor, source_name
+from .parsing import ParserBackend
+from .journal import LeadJournal, recover_journal
+from .records import LeadRecords
+from .resolution import resolve_entities
+from .store import default_lead_store
+from .http_cache import default_cache
+from .http_client import ClientSettings
+from .exporter import export_selected, export_to_csv, export_to_excel, export_to_path
+from .utils import deduplicate_records, lead_id, lead_key, score_lead, logger
+from .search_index import LeadIndex
+from .virtual_table import VirtualTable
+
+# Enriched rows are written to the lead store in batches of this size
+STORE_EVERY = 50
 
 
 class TkTextLogHandler:
@@ -39,8 +52,14 @@ class ScraperApp:
         self.status_var = tk.StringVar(value="Idle")
         self.progress_var = tk.IntVar(value=0)
         self.headless_var = tk.BooleanVar(value=True)
+        self.use_cache_var = tk.BooleanVar(value=True)
+        self.skip_seen_var = tk.BooleanVar(value=True)
         self.max_pages_var = tk.IntVar(value=5)
         self.concurrency_var = tk.IntVar(value=10)
+        self.page_concurrency_var = tk.IntVar(value=3)
+        self.per_host_var = tk.IntVar(value=5)
+        self.detail_workers_var = tk.IntVar(value=3)
+        self.http2_var = tk.BooleanVar(value=False)
         self.delay_var = tk.DoubleVar(value=0.5)
         self.filter_var = tk.StringVar()
         self.domain_filter_var = tk.StringVar()
@@ -55,10 +74,17 @@ class ScraperApp:
             "Generic (HTML)": tk.BooleanVar(value=False),
         }
 
-        self._results: List[Dict[str, str]] = []
+        self._records = LeadRecords()
+        self._store = default_lead_store()
+        self._run: str | None = None
+        # lead_key of each lead left by skip_seen, recorded as seen once stored enriched
+        self._seen_keys: Dict[str, bytes] = {}
+        self._journal = LeadJournal()
         self._scrape_thread: threading.Thread | None = None
 
         self._build_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.root.after(200, self._offer_recovery)
 
     def _build_ui(self) -> None:
         pad = {"padx": 10, "pady": 8}
@@ -88,6 +114,12 @@ class ScraperApp:
         ttk.Spinbox(row_settings, from_=1, to=50, textvariable=self.max_pages_var, width=5).pack(side=tk.LEFT, padx=6)
         ttk.Label(row_settings, text="Concurrency").pack(side=tk.LEFT)
         ttk.Spinbox(row_settings, from_=1, to=50, textvariable=self.concurrency_var, width=5).pack(side=tk.LEFT, padx=6)
+        ttk.Label(row_settings, text="Per host").pack(side=tk.LEFT)
+        ttk.Spinbox(row_settings, from_=1, to=20, textvariable=self.per_host_var, width=5).pack(side=tk.LEFT, padx=6)
+        ttk.Label(row_settings, text="Pages in parallel").pack(side=tk.LEFT)
+        ttk.Spinbox(row_settings, from_=1, to=10, textvariable=self.page_concurrency_var, width=5).pack(side=tk.LEFT, padx=6)
+        ttk.Label(row_settings, text="Maps detail workers").pack(side=tk.LEFT)
+        ttk.Spinbox(row_settings, from_=1, to=8, textvariable=self.detail_workers_var, width=5).pack(side=tk.LEFT, padx=6)
         ttk.Label(row_settings, text="Delay (s)").pack(side=tk.LEFT)
         ttk.Spinbox(row_settings, from_=0, to=5, increment=0.1, textvariable=self.delay_var, width=6).pack(side=tk.LEFT, padx=6)
 
@@ -108,6 +140,9 @@ class ScraperApp:
         row_headless = ttk.Frame(frm)
         row_headless.pack(fill=tk.X, **pad)
         ttk.Checkbutton(row_headless, text="Run headless", variable=self.headless_var).pack(side=tk.LEFT)
+        ttk.Checkbutton(row_headless, text="Use HTTP cache", variable=self.use_cache_var).pack(side=tk.LEFT, padx=10)
+        ttk.Checkbutton(row_headless, text="HTTP/2 for enrichment", variable=self.http2_var).pack(side=tk.LEFT, padx=10)
+        ttk.Checkbutton(row_headless, text="Skip leads seen in earlier runs", variable=self.skip_seen_var).pack(side=tk.LEFT, padx=10)
 
         row3 = ttk.Frame(frm)
         row3.pack(fill=tk.X, **pad)
@@ -147,10 +182,8 @@ class ScraperApp:
         ttk.Button(row_filter, text="Apply", command=self.apply_filter).pack(side=tk.LEFT)
         ttk.Button(row_filter, text="Clear", command=self.clear_filter).pack(side=tk.LEFT, padx=6)
 
-        # Results table with extra columns
-        columns = ("name", "website", "email", "phone", "address", "socials", "source", "score", "status", "notes")
-        self.tree = ttk.Treeview(frm, columns=columns, show="headings", height=18, selectmode="extended")
-        for col, text, width in [
+        # Results table with extra columns; only the rows in view are materialised
+        self.table = VirtualTable(frm, index=LeadIndex(), columns=[
             ("name", "Business Name", 200),
             ("website", "Website", 200),
             ("email", "Email", 180),
@@ -161,10 +194,8 @@ class ScraperApp:
             ("score", "Score", 60),
             ("status", "Status", 100),
             ("notes", "Notes", 200),
-        ]:
-            self.tree.heading(col, text=text)
-            self.tree.column(col, width=width, anchor=tk.W)
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        ])
+        self.table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Inline edit controls for status and notes
         row_edit = ttk.Frame(frm)
@@ -180,6 +211,7 @@ class ScraperApp:
         row6.pack(fill=tk.X, **pad)
         ttk.Button(row6, text="Export CSV (All)", command=self.export_csv).pack(side=tk.LEFT)
         ttk.Button(row6, text="Export Excel (All)", command=self.export_excel).pack(side=tk.LEFT, padx=8)
+        ttk.Button(row6, text="Export JSONL/Parquet (All)", command=self.export_other).pack(side=tk.LEFT)
         ttk.Button(row6, text="Export CSV (Selected)", command=self.export_csv_selected).pack(side=tk.LEFT, padx=16)
         ttk.Button(row6, text="Export Excel (Selected)", command=self.export_excel_selected).pack(side=tk.LEFT)
 
@@ -195,8 +227,10 @@ class ScraperApp:
             messagebox.showerror("Select Sources", "Please select at least one source.")
             return
 
-        self._results = []
-        self.tree.delete(*self.tree.get_children())
+        self._records.clear()
+        self._journal.reset()
+        self.table.clear()
+        self.apply_filter()
         self.status_var.set("Starting...")
         self.progress_var.set(0)
         self.start_btn.configure(state=tk.DISABLED)
@@ -212,11 +246,26 @@ class ScraperApp:
                 int(self.max_pages_var.get()),
                 int(self.concurrency_var.get()),
                 float(self.delay_var.get()),
+                int(self.page_concurrency_var.get()),
+                self.use_cache_var.get(),
+                self._client_settings(),
+                int(self.detail_workers_var.get()),
+                self.skip_seen_var.get(),
             ),
             daemon=True,
         )
         self._scrape_thread.start()
 
+    def _client_settings(self) -> ClientSettings:
+        concurrency = max(1, int(self.concurrency_var.get()))
+        per_host = max(1, int(self.per_host_var.get()))
+        return ClientSettings(
+            max_connections=concurrency * per_host,
+            max_keepalive_connections=concurrency * 2,
+            per_host_connections=per_host,
+            http2=self.http2_var.get(),
+        )
+
     def stop_scraping(self) -> None:
         messagebox.showinfo("Stop", "Stopping after current requests finish.")
         self._stop_flag = True
@@ -226,109 +275,138 @@ class ScraperApp:
         self.status_var.set(status)
 
     def _append_results(self, rows: List[Dict[str, str]]) -> None:
-        # apply domain filter and business email filter on insert
-        domain_filter = (self.domain_filter_var.get() or "").lower().strip()
-        require_business_email = self.require_business_email_var.get()
-        for r in rows:
-            if domain_filter and domain_filter not in (r.get("website") or "").lower():
-                continue
-            if require_business_email:
-                emails = [e.strip() for e in (r.get("email") or "").split(",") if e.strip()]
-                if emails and not any(is_business_email(e) for e in emails):
-                    continue
-            self.tree.insert("", tk.END, values=(
-                r.get("name", ""),
-                r.get("website", ""),
-                r.get("email", ""),
-                r.get("phone", ""),
-                r.get("address", ""),
-                r.get("socials", ""),
-                r.get("source", ""),
-                r.get("score", ""),
-                r.get("status", ""),
-                r.get("notes", ""),
-            ))
-        self._results.extend(rows)
+        # Safe from worker threads: the table queues rows and draws them on the Tk thread
+        self.table.append(self._records.add(rows))
 
     def _autosave(self, rows: List[Dict[str, str]]) -> None:
-        if not rows:
+        # Appends only new or changed rows to the journal. Outside a run every lead is
+        # already in the store, which edits update directly.
+        if self._scrape_thread is None or not self._scrape_thread.is_alive():
             return
-        os.makedirs(".autosave", exist_ok=True)
-        path = os.path.join(".autosave", "leads_autosave.csv")
         try:
-            export_to_csv(rows, path)
-            logger.info(f"Autosaved {len(rows)} rows to {path}")
-        except Exception as e:
+            self._journal.write(rows)
+        except OSError as e:
             logger.warning(f"Autosave failed: {e}")
 
-    def _run_scrape(self, keyword: str, location: str, target_url: str, headless: bool, max_pages: int, concurrency: int, delay: float) -> None:
+    def _offer_recovery(self) -> None:
+        try:
+            rows = recover_journal(self._journal.path)
+        except OSError as e:
+            logger.warning(f"Could not read autosave journal: {e}")
+            return
+        if not rows:
+            return
+        if messagebox.askyesno("Restore", f"Restore {len(rows)} leads autosaved by the previous session?"):
+            # Restored leads become a run in the store, so the journal is no longer needed
+            self._run = self._store.new_run()
+            self._store.upsert(rows, self._run)
+            self._append_results(rows)
+            self.status_var.set(f"Restored {len(rows)} leads.")
+        self._discard_journal()
+
+    def _discard_journal(self) -> None:
+        try:
+            self._journal.discard()
+        except OSError as e:
+            logger.warning(f"Could not remove autosave journal: {e}")
+
+    def _on_close(self) -> None:
+        # A run still in progress keeps its journal for recovery at the next launch
+        self._stop_flag = True
+        try:
+            self._journal.close()
+        except OSError as e:
+            logger.warning(f"Could not close autosave journal: {e}")
+        self.root.destroy()
+
+    def _run_scrape(self, keyword: str, location: str, target_url: str, headless: bool, max_pages: int, concurrency: int, delay: float, page_concurrency: int = 1, use_cache: bool = False, client_settings: ClientSettings | None = None, detail_workers: int = 1, skip_seen: bool = False) -> None:
         self._stop_flag = False
+        self._run = self._store.new_run()
         try:
+            cache = default_cache() if use_cache else None
             selected = []
             if self.source_vars["Google Maps"].get():
-                selected.append(GoogleMapsScraper(headless=headless))
+                selected.append(GoogleMapsScraper(headless=headless, detail_workers=detail_workers))
             if self.source_vars["Yelp (Selenium)"].get():
                 selected.append(YelpSeleniumScraper(headless=headless))
             if self.source_vars["Yelp (Requests)"].get():
-                selected.append(YelpScraper())
+                selected.append(YelpScraper(concurrency=page_concurrency, cache=cache))
             if self.source_vars["Yellow Pages"].get():
-                selected.append(YellowPagesScraper())
+                selected.append(YellowPagesScraper(concurrency=page_concurrency, cache=cache))
             if self.source_vars["Generic (Selenium)"].get() and target_url:
                 selected.append(GenericSeleniumScraper(headless=headless))
             if self.source_vars["Generic (HTML)"].get() and target_url:
-                selected.append(GenericHTMLScraper())
+                selected.append(GenericHTMLScraper(cache=cache))
 
-            all_rows: List[Dict[str, str]] = []
-            for idx, scraper in enumerate(selected, start=1):
-                if self._stop_flag:
-                    break
-                self._update_progress(int((idx - 1) / max(1, len(selected)) * 40), f"Scraping {getattr(scraper, 'name', type(scraper).__name__)}...")
+            def stopped() -> bool:
+                return self._stop_flag
+
+            def run_source(scraper) -> List[Dict[str, str]]:
                 if isinstance(scraper, GenericSeleniumScraper) and target_url:
-                    rows = scraper.search(
+                    return scraper.search(
                         start_url=target_url,
                         locate_cards_css="div[role='article'], .result, .v-card, .container__09f24__mpR8_",
-                        parse_card=lambda el: self._parse_generic_card(el),
+                        parse_card=self._parse_generic_card,
+                        card_spec=DEFAULT_CARD_SPEC,
                         next_button_css="a.next, a[aria-label='Next']",
                         max_pages=max_pages,
+                        stop_flag=stopped,
                     )
-                elif isinstance(scraper, GenericHTMLScraper) and target_url:
-                    rows = scraper.search(
+                if isinstance(scraper, GenericHTMLScraper) and target_url:
+                    return scraper.search(
                         start_url=target_url,
                         select_cards="div[role='article'], .result, .v-card, li",
-                        parse_card=lambda s: self._parse_generic_card_soup(s),
+                        parse_card=lambda card: self._parse_generic_card_html(scraper.parser, card),
                         next_selector="a.next, a[aria-label='Next']",
                         max_pages=max_pages,
+                        stop_flag=stopped,
                     )
-                elif hasattr(scraper, "search"):
+                if hasattr(scraper, "search"):
                     try:
-                        rows = scraper.search(keyword, location, max_pages=max_pages)  # type: ignore[arg-type]
+                        return scraper.search(keyword, location, max_pages=max_pages, stop_flag=stopped)  # type: ignore[arg-type]
                     except TypeError:
-                        rows = scraper.search(keyword, location)
-                else:
-                    rows = []
+                        return scraper.search(keyword, location)
+                return []
+
+            names = ", ".join(source_name(s) for s in selected)
+            self._update_progress(0, f"Scraping {names}...")
+            all_rows: List[Dict[str, str]] = []
+            # One browser source per Chrome instance the detail workers may hold; the HTTP sources
+            # together keep about `concurrency` pages in flight
+            executor = SourceExecutor(browser_workers=detail_workers, http_workers=concurrency // max(1, page_concurrency))
+            for done, (scraper, rows) in enumerate(executor.stream(selected, run_source, stop_flag=stopped), start=1):
                 for r in rows:
-                    r["source"] = getattr(scraper, "name", type(scraper).__name__)
+                    lead_id(r)
+                    r["source"] = source_name(scraper)
                     r["status"] = r.get("status", "New")
                     r["notes"] = r.get("notes", "")
                     r["score"] = score_lead(r)
                 all_rows.extend(rows)
                 self._append_results(rows)
-                self._autosave(all_rows)
+                self._autosave(rows)
+                self._update_progress(int(done / max(1, len(selected)) * 40), f"Finished {source_name(scraper)} ({done}/{len(selected)} sources)")
 
             self._update_progress(45, "Deduplicating...")
-            all_rows = deduplicate_records(all_rows)
+            all_rows = resolve_entities(deduplicate_records(all_rows))
+            self._seen_keys = {}
+            if skip_seen:
+                # Drop leads enriched in earlier runs before paying for enrichment again. The rest
+                # count as seen only once stored enriched, so a stopped run doesn't hide them.
+                all_rows = list(default_dedup_index().filter_new(all_rows, record=False))
+                self._seen_keys = {lead_id(r): lead_key(r) for r in all_rows}
+            self._store.upsert(all_rows, self._run)
+            # Merged and skipped rows leave the autosave too
+            self._journal.retain(all_rows)
 
             self._update_progress(50, "Enriching websites for emails/phones...")
-            from .details import enrich_with_website_details
-            enriched = asyncio.run(enrich_with_website_details(all_rows, concurrency=concurrency, delay_seconds=delay))
-
-            for r in enriched:
-                r["score"] = score_lead(r)
-
-            self.tree.delete(*self.tree.get_children())
-            self._results = []
-            self._append_results(enriched)
-            self._autosave(enriched)
+            # The table is refilled row by row as enrichment completes
+            self.table.clear()
+            self._records.clear()
+            enriched = asyncio.run(self._enrich_incrementally(all_rows, concurrency, delay, cache, client_settings))
+            if cache is not None:
+                logger.info(f"HTTP cache: {cache.stats()}")
+            # Every lead of the run is in the store now; recovery is only for unfinished runs
+            self._discard_journal()
             self._update_progress(95, "Finalizing...")
 
             self.status_var.set(f"Done. {len(enriched)} leads found.")
@@ -339,65 +417,100 @@ class ScraperApp:
             self.start_btn.configure(state=tk.NORMAL)
             self.stop_btn.configure(state=tk.DISABLED)
 
-    def _parse_generic_card(self, el) -> Dict[str, str]:
-        # Try common selectors from directories; fallback to text
-        def safe(css: str) -> str:
-            try:
-                return el.find_element_by_css_selector(css).text.strip()
-            except Exception:
-                try:
-                    return el.find_element("css selector", css).text.strip()
-                except Exception:
-                    return ""
-        def href(css: str) -> str:
-            try:
-                return el.find_element("css selector", css).get_attribute("href") or ""
-            except Exception:
-                return ""
-        name = safe("a, h3, h4")
-        website = href("a[href^='http']")
-        phone = safe(".phone, [data-phone], a[href^='tel:']")
-        addr = safe("address, .address")
-        return {"name": name, "website": website, "email": "", "phone": phone, "address": addr, "socials": ""}
+    async def _enrich_incrementally(self, rows: List[Dict[str, str]], concurrency: int, delay: float, cache, client_settings: ClientSettings | None = None) -> List[Dict[str, str]]:
+        from .details import iter_enriched
+        enriched: List[Dict[str, str]] = []
+        pending: List[Dict[str, str]] = []
+        total = max(1, len(rows))
+        async for r in iter_enriched(rows, concurrency=concurrency, delay_seconds=delay, cache=cache, client_settings=client_settings):
+            r["score"] = score_lead(r)
+            enriched.append(r)
+            pending.append(r)
+            self._append_results([r])
+            self._autosave([r])
+            if len(pending) >= STORE_EVERY:
+                self._store_enriched(pending)
+                pending = []
+            self._update_progress(50 + int(len(enriched) / total * 45), f"Enriched {len(enriched)}/{len(rows)} leads")
+        self._store_enriched(pending)
+        return enriched
+
+    def _store_enriched(self, rows: List[Dict[str, str]]) -> None:
+        self._store.upsert(rows, self._run)
+        if self._seen_keys:
+            default_dedup_index().add_keys(self._seen_keys[lead_id(r)] for r in rows if lead_id(r) in self._seen_keys)
+
+    def _parse_generic_card(self, card: Dict[str, str]) -> Dict[str, str]:
+        # Fields come from DEFAULT_CARD_SPEC; fall back to the card's first line of text
+        name = card.get("name") or card.get("text", "").split("\n")[0].strip()
+        return {
+            "name": name,
+            "website": card.get("website", ""),
+            "email": "",
+            "phone": card.get("phone", ""),
+            "address": card.get("address", ""),
+            "socials": "",
+        }
 
-    def _parse_generic_card_soup(self, soup) -> Dict[str, str]:
+    def _parse_generic_card_html(self, parser: ParserBackend, card) -> Dict[str, str]:
         def textsel(sel: str) -> str:
-            el = soup.select_one(sel)
-            return el.get_text(" ").strip() if el else ""
+            return parser.text(parser.select_one(card, sel))
         def hrefsel(sel: str) -> str:
-            el = soup.select_one(sel)
-            return el.get("href", "").strip() if el else ""
+            return parser.attr(parser.select_one(card, sel), "href").strip()
         name = textsel("a, h3, h4")
         website = hrefsel("a[href^='http']")
         phone = textsel(".phone, .phones, a[href^='tel:']")
         addr = textsel("address, .address, .street-address")
         return {"name": name, "website": website, "email": "", "phone": phone, "address": addr, "socials": ""}
 
+    def _all_rows(self) -> Iterable[Dict[str, str]]:
+        # The store has the current run once sources are merged; before that only the table does.
+        # Store rows are streamed straight into the exporter.
+        if self._run and self._store.count(run=self._run):
+            return self._store.rows(run=self._run)
+        return list(self._records)
+
     def export_csv(self) -> None:
-        if not self._results:
+        if not len(self._records):
             messagebox.showinfo("No Data", "There are no results to export.")
             return
         path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", ".csv")])
         if not path:
             return
-        export_to_csv(self._results, path)
+        export_to_csv(self._all_rows(), path)
         messagebox.showinfo("Saved", f"Saved to {path}")
 
     def export_excel(self) -> None:
-        if not self._results:
+        if not len(self._records):
             messagebox.showinfo("No Data", "There are no results to export.")
             return
         path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel files", ".xlsx")])
         if not path:
             return
-        export_to_excel(self._results, path)
+        export_to_excel(self._all_rows(), path)
+        messagebox.showinfo("Saved", f"Saved to {path}")
+
+    def export_other(self) -> None:
+        if not len(self._records):
+            messagebox.showinfo("No Data", "There are no results to export.")
+            return
+        path = filedialog.asksaveasfilename(
+            defaultextension=".jsonl", filetypes=[("JSON Lines", ".jsonl"), ("Parquet", ".parquet")]
+        )
+        if not path:
+            return
+        try:
+            export_to_path(self._all_rows(), path)
+        except (ImportError, ValueError) as e:
+            messagebox.showerror("Export", str(e))
+            return
         messagebox.showinfo("Saved", f"Saved to {path}")
 
     def export_csv_selected(self) -> None:
-        if not self._results:
+        if not len(self._records):
             messagebox.showinfo("No Data", "There are no results to export.")
             return
-        selected_rows = export_selected(self.tree, self._results)
+        selected_rows = export_selected(self.table.selected_ids(), self._records)
         if not selected_rows:
             messagebox.showinfo("No Selection", "No rows selected.")
             return
@@ -408,10 +521,10 @@ class ScraperApp:
         messagebox.showinfo("Saved", f"Saved to {path}")
 
     def export_excel_selected(self) -> None:
-        if not self._results:
+        if not len(self._records):
             messagebox.showinfo("No Data", "There are no results to export.")
             return
-        selected_rows = export_selected(self.tree, self._results)
+        selected_rows = export_selected(self.table.selected_ids(), self._records)
         if not selected_rows:
             messagebox.showinfo("No Selection", "No rows selected.")
             return
@@ -422,44 +535,28 @@ class ScraperApp:
         messagebox.showinfo("Saved", f"Saved to {path}")
 
     def apply_filter(self) -> None:
-        query = (self.filter_var.get() or "").lower().strip()
-        self.tree.delete(*self.tree.get_children())
-        if not query:
-            self._append_results(self._results)
-            return
-        filtered = []
-        for r in self._results:
-            hay = " ".join([
-                r.get("name", ""), r.get("website", ""), r.get("email", ""), r.get("phone", ""), r.get("address", ""),
-            ]).lower()
-            if query in hay:
-                filtered.append(r)
-        self._append_results(filtered)
+        self.table.set_query(
+            text=self.filter_var.get() or "",
+            domain=self.domain_filter_var.get() or "",
+            business_email=self.require_business_email_var.get(),
+        )
 
     def clear_filter(self) -> None:
         self.filter_var.set("")
-        self.tree.delete(*self.tree.get_children())
-        self._append_results(self._results)
+        self.apply_filter()
 
     def bulk_set_status(self, status: str) -> None:
-        changed = 0
-        for item in self.tree.selection():
-            values = list(self.tree.item(item, "values"))
-            values[8] = status  # status column
-            self.tree.item(item, values=values)
-            # update in _results
-            name, website = values[0], values[1]
-            for r in self._results:
-                if r.get("name") == name and r.get("website") == website:
-                    r["status"] = status
-                    changed += 1
-                    break
-        if changed:
-            messagebox.showinfo("Updated", f"Updated status for {changed} leads.")
+        ids = self.table.selected_ids()
+        edited = self._records.update(ids, status=status)
+        self.table.refresh()
+        self._store.update(ids, status=status)
+        self._autosave(edited)
+        if edited:
+            messagebox.showinfo("Updated", f"Updated status for {len(edited)} leads.")
 
     def add_note_dialog(self) -> None:
-        items = self.tree.selection()
-        if not items:
+        ids = self.table.selected_ids()
+        if not ids:
             messagebox.showinfo("No Selection", "Select one or more rows first.")
             return
         dlg = tk.Toplevel(self.root)
@@ -469,20 +566,13 @@ class ScraperApp:
         ttk.Entry(dlg, textvariable=note_var, width=60).pack(padx=10, pady=6)
         def save_note():
             note = note_var.get().strip()
-            changed = 0
-            for item in items:
-                values = list(self.tree.item(item, "values"))
-                values[9] = note  # notes column
-                self.tree.item(item, values=values)
-                name, website = values[0], values[1]
-                for r in self._results:
-                    if r.get("name") == name and r.get("website") == website:
-                        r["notes"] = note
-                        changed += 1
-                        break
+            edited = self._records.update(ids, notes=note)
+            self.table.refresh()
+            self._store.update(ids, notes=note)
+            self._autosave(edited)
             dlg.destroy()
-            if changed:
-                messagebox.showinfo("Saved", f"Added notes to {changed} leads.")
+            if edited:
+                messagebox.showinfo("Saved", f"Added notes to {len(edited)} leads.")
         ttk.Button(dlg, text="Save", command=save_note).pack(padx=10, pady=8)
 
 
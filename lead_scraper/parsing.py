@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import functools
+import io
+import re
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
+
+from .utils import logger, normalize_space
+
+try:
+    from cssselect import GenericTranslator
+except ImportError:  # optional: without it scrapers fall back to BeautifulSoup
+    GenericTranslator = None
+
+# A parsed page or an element inside it; the concrete type depends on the backend
+Node = Any
+
+_UPPER = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_LOWER = "abcdefghijklmnopqrstuvwxyz"
+
+
+_ATTR_RULE = re.compile(r"^([\w*]*)\[([\w-]+)=[\"']?([^\"'\]]*)[\"']?\]$")
+ScopeRule = Tuple[str, str, str, str, str]
+
+
+@functools.lru_cache(maxsize=128)
+def _scope_rule(selector: str) -> ScopeRule:
+    """Split a scope selector of the form tag, tag.class, tag#id or tag[attr=value]
+    into (tag, class, id, attr, value)."""
+    tag, cls, ident, attr, value = selector.strip(), "", "", "", ""
+    match = _ATTR_RULE.match(tag)
+    if match:
+        tag, attr, value = match.groups()
+    elif "#" in tag:
+        tag, ident = tag.split("#", 1)
+    elif "." in tag:
+        tag, cls = tag.split(".", 1)
+    return tag.lower() or "*", cls, ident, attr, value
+
+
+def _in_scope(rules: Sequence[ScopeRule], tag: str, attrs) -> bool:
+    for want_tag, cls, ident, attr, value in rules:
+        if want_tag != "*" and want_tag != tag:
+            continue
+        if ident and attrs.get("id") != ident:
+            continue
+        if attr and attrs.get(attr) != value:
+            continue
+        if cls:
+            classes = attrs.get("class") or ""
+            if isinstance(classes, str):
+                classes = classes.split()
+            if cls not in classes:
+                continue
+        return True
+    return False
+
+
+class ParserBackend:
+    """The few tree operations the scrapers need, so the tree library can be swapped.
+
+    `parse(markup, scope)` builds only the elements matching the scope selectors
+    (tag, tag.class, tag#id or tag[attr=value]) and their subtrees. If nothing on the page matches,
+    the whole page is parsed so a layout change degrades to the full parse.
+    """
+
+    name = "base"
+
+    def parse(self, markup: str, scope: Sequence[str] | None = None) -> Node:
+        raise NotImplementedError
+
+    def select(self, node: Node, css: str) -> List[Node]:
+        raise NotImplementedError
+
+    def select_one(self, node: Node, css: str) -> Optional[Node]:
+        found = self.select(node, css)
+        return found[0] if found else None
+
+    def text(self, node: Optional[Node]) -> str:
+        """Whitespace-normalised text of `node`, or "" for None."""
+        raise NotImplementedError
+
+    def attr(self, node: Optional[Node], name: str) -> str:
+        raise NotImplementedError
+
+    def find_link(self, node: Node, contains: str) -> Optional[Node]:
+        """First <a> under `node` whose text contains `contains`, case-insensitively."""
+        raise NotImplementedError
+
+
+class SoupBackend(ParserBackend):
+    name = "bs4"
+
+    def parse(self, markup: str, scope: Sequence[str] | None = None) -> Node:
+        if scope:
+            rules = [_scope_rule(s) for s in scope]
+            strainer = SoupStrainer(lambda tag, attrs: _in_scope(rules, tag, attrs))
+            soup = BeautifulSoup(markup, "lxml", parse_only=strainer)
+            if soup.contents:
+                return soup
+            logger.warning(f"Parse scope {list(scope)} matched nothing, parsing the whole page")
+        return BeautifulSoup(markup, "lxml")
+
+    def select(self, node: Node, css: str) -> List[Node]:
+        return node.select(css)
+
+    def select_one(self, node: Node, css: str) -> Optional[Node]:
+        return node.select_one(css)
+
+    def text(self, node: Optional[Node]) -> str:
+        return normalize_space(node.get_text(" ")) if node is not None else ""
+
+    def attr(self, node: Optional[Node], name: str) -> str:
+        return (node.get(name) or "") if node is not None else ""
+
+    def find_link(self, node: Node, contains: str) -> Optional[Node]:
+        needle = contains.lower()
+        return node.find("a", string=lambda s: s and needle in s.lower())
+
+
+@functools.lru_cache(maxsize=512)
+def css_to_xpath(css: str) -> str:
+    # Translation is the expensive step, so it is done once per selector for the process.
+    # The descendant:: prefix matches soupsieve, which never returns the context node itself.
+    return GenericTranslator().css_to_xpath(css, prefix="descendant::")
+
+
+class LxmlBackend(ParserBackend):
+    """lxml.html trees queried with CSS selectors compiled to XPath.
+
+    Each selector is translated once and compiled once per thread (compiled XPath
+    objects are not shared across threads), so per-card lookups cost one XPath call.
+    """
+
+    name = "lxml"
+
+    def __init__(self) -> None:
+        if GenericTranslator is None:
+            raise ImportError("LxmlBackend needs the 'cssselect' package")
+        self._local = threading.local()
+
+    def _compiled(self, key: str, build) -> etree.XPath:
+        cache: Optional[Dict[str, etree.XPath]] = getattr(self._local, "xpaths", None)
+        if cache is None:
+            cache = self._local.xpaths = {}
+        xpath = cache.get(key)
+        if xpath is None:
+            xpath = cache[key] = etree.XPath(build())
+        return xpath
+
+    def parse(self, markup: str, scope: Sequence[str] | None = None) -> Node:
+        if not markup or not markup.strip():
+            return lxml_html.fromstring("<html></html>")
+        if scope:
+            doc = self._parse_scoped(markup, [_scope_rule(s) for s in scope])
+            if len(doc):
+                return doc
+            logger.warning(f"Parse scope {list(scope)} matched nothing, parsing the whole page")
+        # lxml rejects str input with an <?xml encoding=...?> declaration, so parse the text as
+        # UTF-8 bytes with the encoding forced (a <meta charset> must not re-decode it either)
+        return lxml_html.document_fromstring(markup.encode("utf-8", errors="replace"), parser=self._parser())
+
+    def _parser(self) -> lxml_html.HTMLParser:
+        # Parsers are not shared across threads
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = self._local.parser = lxml_html.HTMLParser(encoding="utf-8")
+        return parser
+
+    @staticmethod
+    def _parse_scoped(markup: str, rules: List[ScopeRule]) -> Node:
+        """Stream the page and keep only in-scope subtrees.
+
+        The text is parsed as UTF-8 bytes with the encoding forced, for the same reason
+        as in `parse`. Events are only raised for the scope's tag names, which keeps the Python side
+        of the loop small. Each in-scope element is moved to a fresh root as soon as
+        it is complete; any other element of those tags is cleared as it closes,
+        together with the siblings before it, so the tree holds little more than the
+        kept regions and the currently open ancestors.
+        """
+        tags = {rule[0] for rule in rules}
+        root = lxml_html.Element("html")
+        depth = 0
+        events = etree.iterparse(
+            io.BytesIO(markup.encode("utf-8", errors="replace")),
+            events=("start", "end"),
+            tag=None if "*" in tags else sorted(tags),
+            html=True,
+            encoding="utf-8",
+            no_network=True,
+            recover=True,
+        )
+        for event, elem in events:
+            if not isinstance(elem.tag, str):
+                continue  # comments and processing instructions
+            if event == "start":
+                if depth or _in_scope(rules, elem.tag, elem.attrib):
+                    depth += 1
+                continue
+            if depth:
+                depth -= 1
+                if depth == 0:
+                    tail = elem.tail
+                    root.append(elem)
+                    elem.tail = tail
+                continue
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        return root
+
+    def select(self, node: Node, css: str) -> List[Node]:
+        return self._compiled(css, lambda: css_to_xpath(css))(node)
+
+    def text(self, node: Optional[Node]) -> str:
+        if node is None:
+            return ""
+        return normalize_space(" ".join(node.itertext()))
+
+    def attr(self, node: Optional[Node], name: str) -> str:
+        return (node.get(name) or "") if node is not None else ""
+
+    def find_link(self, node: Node, contains: str) -> Optional[Node]:
+        needle = contains.lower()
+        found = self._compiled(
+            f"link:{needle}",
+            lambda: f".//a[contains(translate(string(.), '{_UPPER}', '{_LOWER}'), $needle)]",
+        )(node, needle=needle)
+        return found[0] if found else None
+
+
+@functools.lru_cache(maxsize=1)
+def default_parser() -> ParserBackend:
+    """LxmlBackend when cssselect is installed, otherwise SoupBackend."""
+    if GenericTranslator is None:
+        logger.warning("cssselect is not installed, parsing pages with BeautifulSoup")
+        return SoupBackend()
+    return LxmlBackend()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token bucket shared by threads and coroutines.
+
+    `rate` is tokens per second (<= 0 disables limiting), `burst` is the bucket size and
+    `jitter` adds up to that many random seconds to every wait so throttled requests do
+    not line up on exact intervals. Callers reserve a token under the lock and sleep
+    outside it, so waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, jitter: float = 0.0) -> None:
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self.jitter = max(0.0, float(jitter))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+        if self.jitter:
+            wait += random.uniform(0.0, self.jitter)
+        return wait
+
+    def idle_since(self) -> float:
+        return self._updated
+
+    def acquire(self) -> float:
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+
+def host_key(url_or_host: str) -> str:
+    host = urlparse(url_or_host).hostname if "//" in url_or_host else url_or_host
+    host = (host or "").lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+def rate_for_delay(delay_seconds: float) -> float:
+    """Translate a legacy fixed delay into a request rate (0 means unlimited)."""
+    return 1.0 / delay_seconds if delay_seconds and delay_seconds > 0 else 0.0
+
+
+class RateLimiter:
+    """Registry of per-host token buckets.
+
+    Budgets set with `configure` take precedence; otherwise a bucket is created on first
+    use from the `rate`/`burst` hint given by the caller, falling back to the limiter
+    defaults.
+    """
+
+    max_idle_buckets = 5000
+
+    def __init__(self, rate: float = 0.5, burst: int = 2, jitter: float = 0.0) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self._budgets: Dict[str, Dict[str, float]] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def configure(
+        self,
+        host: str,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        jitter: Optional[float] = None,
+    ) -> None:
+        key = host_key(host)
+        budget = {
+            "rate": self.rate if rate is None else rate,
+            "burst": self.burst if burst is None else burst,
+            "jitter": self.jitter if jitter is None else jitter,
+        }
+        with self._lock:
+            self._budgets[key] = budget
+            self._buckets[key] = TokenBucket(budget["rate"], int(budget["burst"]), budget["jitter"])
+
+    def bucket(self, url: str, rate: Optional[float] = None, burst: Optional[int] = None) -> TokenBucket:
+        key = host_key(url)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_idle_buckets:
+                    self._prune()
+                bucket = TokenBucket(
+                    self.rate if rate is None else rate,
+                    self.burst if burst is None else burst,
+                    self.jitter,
+                )
+                self._buckets[key] = bucket
+            return bucket
+
+    def _prune(self) -> None:
+        # Drop unconfigured buckets that have been idle long enough to be full again
+        cutoff = time.monotonic() - 60.0
+        for key in [k for k, b in self._buckets.items() if k not in self._budgets and b.idle_since() < cutoff]:
+            del self._buckets[key]
+
+    def acquire(self, url: str, rate: Optional[float] = None, burst: Optional[int] = None) -> float:
+        return self.bucket(url, rate, burst).acquire()
+
+    async def acquire_async(self, url: str, rate: Optional[float] = None, burst: Optional[int] = None) -> float:
+        return await self.bucket(url, rate, burst).acquire_async()
+
+
+# Process-wide limiter shared by every scraper and the enrichment client
+RATE_LIMITER = RateLimiter(rate=0.5, burst=2, jitter=0.5)
+RATE_LIMITER.configure("yellowpages.com", rate=0.5, burst=3, jitter=1.0)
+RATE_LIMITER.configure("yelp.com", rate=0.3, burst=2, jitter=1.5)
+RATE_LIMITER.configure("google.com", rate=1.0, burst=3, jitter=0.5)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .utils import lead_id
+
+
+class LeadRecords:
+    """The leads of one run, indexed by their stable id, in arrival order.
+
+    The desktop table, status and note edits and "Export (Selected)" all look rows
+    up here by id instead of scanning the results for a matching name and website.
+    Adding a row whose id is already present keeps the first one, the same rule
+    `deduplicate_records` applies.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_id: Dict[str, Dict[str, str]] = {}
+
+    def add(self, rows: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Index `rows` and return the ones that were not already present."""
+        added: List[Dict[str, str]] = []
+        with self._lock:
+            for row in rows:
+                ident = lead_id(row)
+                if ident not in self._by_id:
+                    self._by_id[ident] = row
+                    added.append(row)
+        return added
+
+    def get(self, ident: str) -> Optional[Dict[str, str]]:
+        return self._by_id.get(ident)
+
+    def __contains__(self, ident: str) -> bool:
+        return ident in self._by_id
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        return iter(list(self._by_id.values()))
+
+    def rows(self, ids: Iterable[str]) -> List[Dict[str, str]]:
+        """The rows for `ids`, in the given order; unknown ids are skipped."""
+        by_id = self._by_id
+        return [by_id[i] for i in ids if i in by_id]
+
+    def update(self, ids: Iterable[str], **fields: str) -> List[Dict[str, str]]:
+        """Set `fields` on the rows for `ids` in place and return the edited rows."""
+        edited = self.rows(ids)
+        with self._lock:
+            for row in edited:
+                row.update(fields)
+        return edited
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_id.clear()
@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .utils import domain_from_url, key_phone, key_text, logger
+
+# Legal forms and filler words that differ between directories for the same business
+NAME_STOPWORDS = {
+    "the", "and", "llc", "inc", "incorporated", "co", "corp", "corporation", "company",
+    "ltd", "limited", "llp", "pllc", "pc", "plc", "group",
+}
+# Hosts that many unrelated businesses link to, so a shared one says nothing
+SHARED_DOMAINS = {
+    "facebook.com", "instagram.com", "twitter.com", "x.com", "linkedin.com", "youtube.com",
+    "yelp.com", "yellowpages.com", "google.com", "business.site", "wixsite.com", "squarespace.com",
+    "godaddysites.com", "linktr.ee",
+}
+_MERSENNE = (1 << 61) - 1
+_HOUSE_NUMBER = re.compile(r"\b\d+[a-z]?\b")
+
+
+def _name(text: str) -> str:
+    words = key_text((text or "").replace("'", "").replace("’", "")).split()
+    return " ".join(w for w in words if w not in NAME_STOPWORDS)
+
+
+def _shingles(text: str, k: int = 3) -> Set[str]:
+    text = f" {text} "
+    if len(text) <= k:
+        return {text} if text.strip() else set()
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class _Record:
+    __slots__ = ("name", "name_sh", "address_sh", "number", "phone", "domain")
+
+    def __init__(self, row: Dict[str, str]) -> None:
+        self.name = _name(row.get("name") or "")
+        self.name_sh = _shingles(self.name)
+        address = key_text(row.get("address") or "")
+        self.address_sh = _shingles(address)
+        match = _HOUSE_NUMBER.search(address)
+        self.number = match.group(0) if match else ""
+        phone = key_phone((row.get("phone") or "").split(",")[0])
+        self.phone = phone if len(phone) >= 7 else ""
+        domain = domain_from_url((row.get("website") or "").lower().strip().rstrip("/"))
+        self.domain = domain if domain not in SHARED_DOMAINS else ""
+
+
+class _UnionFind:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> bool:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if ra > rb:
+            ra, rb = rb, ra
+        # Lower index wins so a cluster is represented by its first-seen row
+        self.parent[rb] = ra
+        return True
+
+
+class EntityResolver:
+    """Clusters leads that describe the same business and merges each cluster.
+
+    Candidate pairs only come from shared blocks: the same phone number, the same
+    registered domain, or the same MinHash LSH band over name and address shingles.
+    Each candidate pair is then verified with shingle Jaccard similarity. Blocks
+    bigger than `max_block` (a call-centre number, a franchise domain) are skipped,
+    so the work stays close to linear in the number of rows.
+    """
+
+    def __init__(
+        self,
+        name_threshold: float = 0.6,
+        address_threshold: float = 0.5,
+        num_perm: int = 32,
+        bands: int = 8,
+        max_block: int = 50,
+        seed: int = 1,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.name_threshold = name_threshold
+        self.address_threshold = address_threshold
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.max_block = max_block
+        rnd = np.random.default_rng(seed)
+        # a < 2**29 and 32-bit shingle hashes keep a*x+b inside uint64
+        self._a = rnd.integers(1, 1 << 29, size=num_perm, dtype=np.uint64)
+        self._b = rnd.integers(0, _MERSENNE, size=num_perm, dtype=np.uint64)
+
+    def _signature(self, shingles: Set[str]) -> Optional[np.ndarray]:
+        if not shingles:
+            return None
+        x = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        return ((np.outer(self._a, x) + self._b[:, None]) % np.uint64(_MERSENNE)).min(axis=1)
+
+    def _blocks(self, records: List[_Record]) -> Iterable[List[int]]:
+        blocks: Dict[Tuple, List[int]] = defaultdict(list)
+        r = self.rows_per_band
+        for i, rec in enumerate(records):
+            if rec.phone:
+                blocks[("p", rec.phone)].append(i)
+            if rec.domain:
+                blocks[("d", rec.domain)].append(i)
+            sig = self._signature(rec.name_sh | {"@" + s for s in rec.address_sh})
+            if sig is None:
+                continue
+            for band in range(self.bands):
+                blocks[("b", band, sig[band * r:(band + 1) * r].tobytes())].append(i)
+        skipped = 0
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block:
+                skipped += 1
+                continue
+            yield members
+        if skipped:
+            logger.info(f"Entity resolution: skipped {skipped} oversized blocks")
+
+    def _address_match(self, a: _Record, b: _Record) -> Optional[bool]:
+        """Whether two addresses agree, or None when either is missing."""
+        if not (a.address_sh and b.address_sh):
+            return None
+        if a.number and b.number and a.number != b.number:
+            # Neighbours on one street share most of their address shingles
+            return False
+        return _jaccard(a.address_sh, b.address_sh) >= self.address_threshold
+
+    def _same(self, a: _Record, b: _Record) -> bool:
+        shared_domain = bool(a.domain) and a.domain == b.domain
+        name_sim = 1.0 if a.name and a.name == b.name else _jaccard(a.name_sh, b.name_sh)
+        if a.phone and b.phone and a.phone != b.phone:
+            # Different numbers: branches of a chain share a website, so only the
+            # same name at the same address is one business (with a second line)
+            return shared_domain and name_sim >= self.name_threshold and self._address_match(a, b) is True
+        if a.phone and a.phone == b.phone:
+            return name_sim >= self.name_threshold / 2
+        if shared_domain:
+            # A shared website stands in for a missing phone, unless the addresses disagree
+            return name_sim >= self.name_threshold / 2 and self._address_match(a, b) is not False
+        if name_sim < self.name_threshold:
+            return False
+        address = self._address_match(a, b)
+        if address is not None:
+            return address
+        # Without both addresses only a near-identical name is enough
+        return name_sim >= 0.9
+
+    def clusters(self, rows: List[Dict[str, str]]) -> List[List[int]]:
+        """Row indexes grouped by entity, each group and the list in first-seen order."""
+        records = [_Record(r) for r in rows]
+        uf = _UnionFind(len(records))
+        compared: Set[Tuple[int, int]] = set()
+        for members in self._blocks(records):
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    i, j = members[x], members[y]
+                    if (i, j) in compared or uf.find(i) == uf.find(j):
+                        continue
+                    compared.add((i, j))
+                    if self._same(records[i], records[j]):
+                        uf.union(i, j)
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for i in range(len(records)):
+            groups[uf.find(i)].append(i)
+        return sorted(groups.values(), key=lambda g: g[0])
+
+    def resolve(self, rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        groups = self.clusters(rows)
+        merged = [merge_records([rows[i] for i in g]) if len(g) > 1 else rows[g[0]] for g in groups]
+        if len(merged) < len(rows):
+            logger.info(f"Entity resolution: merged {len(rows)} leads into {len(merged)}")
+        return merged
+
+
+def _joined(values: Iterable[str], limit: int) -> str:
+    seen: List[str] = []
+    for value in values:
+        for part in (value or "").split(","):
+            part = part.strip()
+            if part and part not in seen:
+                seen.append(part)
+    return ", ".join(seen[:limit])
+
+
+def merge_records(rows: List[Dict[str, str]]) -> Dict[str, str]:
+    """Combine rows describing one business, field by field."""
+    merged = dict(rows[0])
+
+    def first(field: str) -> str:
+        return next((r[field] for r in rows if (r.get(field) or "").strip()), "")
+
+    # The longest name and address usually carry the most detail ("Joe's Plumbing LLC")
+    merged["name"] = max((r.get("name") or "" for r in rows), key=len)
+    merged["address"] = max((r.get("address") or "" for r in rows), key=len)
+    merged["website"] = first("website")
+    merged["phone"] = first("phone")
+    merged["email"] = _joined((r.get("email", "") for r in rows), 3)
+    merged["socials"] = _joined((r.get("socials", "") for r in rows), 5)
+    merged["source"] = _joined((r.get("source", "") for r in rows), 10)
+    merged["notes"] = _joined((r.get("notes", "") for r in rows), 10)
+    return merged
+
+
+def resolve_entities(rows: List[Dict[str, str]], resolver: EntityResolver | None = None) -> List[Dict[str, str]]:
+    return (resolver or EntityResolver()).resolve(rows)
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .utils import is_business_email
+
+SEARCH_FIELDS = ("name", "website", "email", "phone", "address")
+
+# Per-row flags, computed once when the row is added
+HAS_EMAIL = 1
+BUSINESS_EMAIL = 2
+HAS_WEBSITE = 4
+HAS_PHONE = 8
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _TrigramIndex:
+    """Substring search over one lowercase string per row.
+
+    Each trigram maps to the ascending row positions that contain it. A query is
+    answered by intersecting the postings of its rarest trigrams and confirming the
+    few remaining candidates with a plain substring test. Queries shorter than
+    three characters fall back to a scan.
+    """
+
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+        self._postings: Dict[str, array] = {}
+
+    def add(self, text: str) -> None:
+        pos = len(self.texts)
+        self.texts.append(text)
+        postings = self._postings
+        for gram in _trigrams(text):
+            ids = postings.get(gram)
+            if ids is None:
+                ids = postings[gram] = array("I")
+            ids.append(pos)
+
+    def search(self, query: str) -> List[int]:
+        texts = self.texts
+        if len(query) < 3:
+            return [i for i, t in enumerate(texts) if query in t]
+        postings = []
+        for gram in _trigrams(query):
+            ids = self._postings.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+        postings.sort(key=len)
+        candidates = np.frombuffer(postings[0], dtype=np.uint32)
+        for ids in postings[1:]:
+            if len(candidates) <= 32:
+                break  # cheaper to check the rest directly
+            other = np.frombuffer(ids, dtype=np.uint32)
+            at = np.searchsorted(other, candidates)
+            at[at == len(other)] = 0
+            candidates = candidates[other[at] == candidates]
+        return [i for i in candidates.tolist() if query in texts[i]]
+
+    def matches(self, pos: int, query: str) -> bool:
+        return query in self.texts[pos]
+
+
+class LeadIndex:
+    """Search index for the lead table, kept up to date as rows arrive.
+
+    Rows are addressed by the position they were added at, which is their index in
+    the table's row list. `search` answers the table's text, domain and
+    business-email filters without touching the rows themselves.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self._text = _TrigramIndex()
+        self._site = _TrigramIndex()
+        self._flags = bytearray()
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def add(self, rows: Iterable[Dict[str, str]]) -> None:
+        for r in rows:
+            self._text.add(" ".join(str(r.get(f) or "") for f in SEARCH_FIELDS).lower())
+            self._site.add(str(r.get("website") or "").lower())
+            emails = [e.strip() for e in str(r.get("email") or "").split(",") if e.strip()]
+            flags = 0
+            if emails:
+                flags |= HAS_EMAIL
+                if any(is_business_email(e) for e in emails):
+                    flags |= BUSINESS_EMAIL
+            if (r.get("website") or "").strip():
+                flags |= HAS_WEBSITE
+            if (r.get("phone") or "").strip():
+                flags |= HAS_PHONE
+            self._flags.append(flags)
+
+    def flags(self, pos: int) -> int:
+        return self._flags[pos]
+
+    @staticmethod
+    def _email_ok(flags: int) -> bool:
+        # Rows without any email pass, as before; rows with only free-mail addresses do not
+        return not flags & HAS_EMAIL or bool(flags & BUSINESS_EMAIL)
+
+    def search(self, text: str = "", domain: str = "", business_email: bool = False) -> Optional[List[int]]:
+        """Ascending positions of the matching rows, or None when nothing is filtered."""
+        text, domain = text.lower().strip(), domain.lower().strip()
+        if not (text or domain or business_email):
+            return None
+        found: Optional[np.ndarray] = None
+        for index, query in ((self._text, text), (self._site, domain)):
+            if not query:
+                continue
+            hits = np.asarray(index.search(query), dtype=np.int64)
+            found = hits if found is None else np.intersect1d(found, hits, assume_unique=True)
+        if business_email:
+            flags = np.frombuffer(bytes(self._flags), dtype=np.uint8)
+            ok = ((flags & HAS_EMAIL) == 0) | ((flags & BUSINESS_EMAIL) != 0)
+            found = np.flatnonzero(ok) if found is None else found[ok[found]]
+        return found.tolist()
+
+    def matches(self, pos: int, text: str = "", domain: str = "", business_email: bool = False) -> bool:
+        """The same test as `search` for a single row."""
+        text, domain = text.lower().strip(), domain.lower().strip()
+        if text and not self._text.matches(pos, text):
+            return False
+        if domain and not self._site.matches(pos, domain):
+            return False
+        return not business_email or self._email_ok(self._flags[pos])
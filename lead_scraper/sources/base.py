@@ -1,33 +1,84 @@
 from __future__ import annotations
 
-import time
+import threading
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
 
-from ..utils import logger, get_random_user_agent, sleep_random
+from ..http_cache import ResponseCache
+from ..parsing import Node, ParserBackend, default_parser
+from ..ratelimit import RATE_LIMITER, RateLimiter, rate_for_delay
+from ..utils import logger, get_random_user_agent
 
 
 class BaseDirectoryScraper(ABC):
     name: str = "base"
+    # Regions of a result page that parsing needs (tag, tag.class or tag#id); empty parses everything
+    parse_scope: Tuple[str, ...] = ()
 
-    def __init__(self, delay_seconds: float = 1.0) -> None:
+    def __init__(
+        self,
+        delay_seconds: float = 1.0,
+        concurrency: int = 1,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        parser: ParserBackend | None = None,
+    ) -> None:
+        # Only used as the request interval for hosts without a configured budget
         self.delay_seconds = delay_seconds
+        # Max result pages in flight at once against this scraper's host
+        self.concurrency = max(1, int(concurrency))
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        self.cache = cache
+        self.parser = parser or default_parser()
+        self._local = threading.local()
 
     @abstractmethod
     def build_search_url(self, keyword: str, location: str, page: int) -> str:
         raise NotImplementedError
 
     @abstractmethod
-    def parse_search_results(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def parse_search_results(self, doc: Node) -> List[Dict[str, str]]:
         raise NotImplementedError
 
     @abstractmethod
-    def has_next_page(self, soup: BeautifulSoup, page: int) -> bool:
+    def has_next_page(self, doc: Node, page: int) -> bool:
         raise NotImplementedError
 
+    def _session(self) -> requests.Session:
+        # requests.Session is not guaranteed thread-safe, keep one per worker
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
+    def _fetch_page(self, url: str) -> Tuple[str, Optional[Node]]:
+        """Fetch one result page. Returns ("ok", doc), ("http_error", None) or ("error", None)."""
+        headers = {
+            "User-Agent": get_random_user_agent(),
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+        def throttle() -> None:
+            self.rate_limiter.acquire(url, rate=rate_for_delay(self.delay_seconds))
+
+        logger.info(f"Fetching URL: {url}")
+        try:
+            if self.cache is not None:
+                resp = self.cache.fetch(self._session(), url, throttle=throttle, headers=headers, timeout=20)
+            else:
+                throttle()
+                resp = self._session().get(url, headers=headers, timeout=20)
+            if resp.status_code >= 400:
+                logger.error(f"HTTP {resp.status_code} for {url}")
+                return "http_error", None
+            return "ok", self.parser.parse(resp.text, scope=self.parse_scope)
+        except Exception as e:
+            logger.exception(f"Error fetching {url}: {e}")
+            return "error", None
+
     def search(
         self,
         keyword: str,
@@ -35,32 +86,45 @@ class BaseDirectoryScraper(ABC):
         max_pages: int = 5,
         stop_flag: Callable[[], bool] | None = None,
     ) -> List[Dict[str, str]]:
+        """Fetch result pages in windows of `concurrency` pages.
+
+        Pages inside a window are fetched in parallel but consumed in page order, so
+        results keep their order and pagination stops at the first page that has no
+        results, has no next link or fails with an HTTP error. Pages speculatively
+        fetched past that point are discarded. Pacing is left to the per-host rate
+        limiter, so workers only wait when the host budget is exhausted.
+        """
         results: List[Dict[str, str]] = []
-        session = requests.Session()
-
-        for page in range(1, max_pages + 1):
-            if stop_flag and stop_flag():
-                break
-            url = self.build_search_url(keyword, location, page)
-            headers = {
-                "User-Agent": get_random_user_agent(),
-                "Accept-Language": "en-US,en;q=0.9",
-            }
-            logger.info(f"Fetching URL: {url}")
-            try:
-                resp = session.get(url, headers=headers, timeout=20)
-                if resp.status_code >= 400:
-                    logger.error(f"HTTP {resp.status_code} for {url}")
+        page = 1
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while page <= max_pages:
+                if stop_flag and stop_flag():
                     break
-                soup = BeautifulSoup(resp.text, "lxml")
-                page_results = self.parse_search_results(soup)
-                logger.info(f"Parsed {len(page_results)} results from {url}")
-                results.extend(page_results)
-                if not self.has_next_page(soup, page):
+                window = list(range(page, min(page + self.concurrency, max_pages + 1)))
+                urls = [self.build_search_url(keyword, location, p) for p in window]
+                fetched = list(pool.map(self._fetch_page, urls))
+
+                finished = False
+                for p, url, (status, doc) in zip(window, urls, fetched):
+                    if status == "http_error":
+                        finished = True
+                        break
+                    if doc is None:
+                        continue
+                    try:
+                        page_results = self.parse_search_results(doc)
+                        logger.info(f"Parsed {len(page_results)} results from {url}")
+                        if not page_results:
+                            finished = True
+                            break
+                        results.extend(page_results)
+                        if not self.has_next_page(doc, p):
+                            finished = True
+                            break
+                    except Exception as e:
+                        logger.exception(f"Error parsing {url}: {e}")
+
+                if finished:
                     break
-            except Exception as e:
-                logger.exception(f"Error fetching {url}: {e}")
-            finally:
-                time.sleep(self.delay_seconds)
-                sleep_random(1.0, 3.0)
+                page += len(window)
         return results
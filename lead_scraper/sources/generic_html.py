@@ -4,54 +4,83 @@ from typing import Dict, List, Callable
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
 
-from ..utils import logger, get_random_user_agent, retry_request, sleep_random, normalize_space
+from ..http_cache import ResponseCache
+from ..parsing import Node, ParserBackend, default_parser
+from ..ratelimit import RATE_LIMITER, RateLimiter, rate_for_delay
+from ..utils import logger, get_random_user_agent, retry_request
 
 
 class GenericHTMLScraper:
     name = "Generic HTML"
 
-    def __init__(self, delay_seconds: float = 1.0) -> None:
+    def __init__(
+        self,
+        delay_seconds: float = 1.0,
+        rate_limiter: RateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        parser: ParserBackend | None = None,
+    ) -> None:
         self.delay_seconds = delay_seconds
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+        self.cache = cache
+        self.parser = parser or default_parser()
+
+    def _get(self, session: requests.Session, url: str):
+        headers = {
+            "User-Agent": get_random_user_agent(),
+            "Accept-Language": "en-US,en;q=0.9",
+        }
+
+        def throttle() -> None:
+            self.rate_limiter.acquire(url, rate=rate_for_delay(self.delay_seconds))
+
+        if self.cache is not None:
+            return self.cache.fetch(session, url, throttle=throttle, headers=headers, timeout=25)
+        throttle()
+        return session.get(url, headers=headers, timeout=25)
 
     def search(
         self,
         start_url: str,
-        parse_card: Callable[[BeautifulSoup], Dict[str, str]],
+        parse_card: Callable[[Node], Dict[str, str]],
         select_cards: str,
         next_selector: str | None = None,
         max_pages: int = 3,
+        stop_flag: Callable[[], bool] | None = None,
     ) -> List[Dict[str, str]]:
+        """Collect cards from `start_url` onwards.
+
+        `parse_card` gets each card as a node of the page tree, not a copy, so it
+        should read it through `self.parser` (select_one, text, attr).
+        """
         results: List[Dict[str, str]] = []
         session = requests.Session()
         url = start_url
         pages = 0
         while url and pages < max_pages:
+            if stop_flag and stop_flag():
+                break
             logger.info(f"Fetching URL: {url}")
-            resp = retry_request(lambda: session.get(url, headers={
-                "User-Agent": get_random_user_agent(),
-                "Accept-Language": "en-US,en;q=0.9",
-            }, timeout=25))
+            resp = retry_request(lambda: self._get(session, url))
             if not resp or resp.status_code >= 400:
                 logger.error(f"Failed to fetch {url}")
                 break
-            soup = BeautifulSoup(resp.text, "lxml")
-            cards = soup.select(select_cards)
+            doc = self.parser.parse(resp.text)
+            cards = self.parser.select(doc, select_cards)
             logger.info(f"Parsed {len(cards)} cards from {url}")
             for c in cards:
                 try:
-                    data = parse_card(BeautifulSoup(str(c), "lxml"))
+                    data = parse_card(c)
                     if data.get("name"):
                         results.append(data)
                 except Exception as e:
                     logger.warning(f"Card parse error on {url}: {e}")
             pages += 1
-            sleep_random(1.0, 5.0)
             if next_selector:
-                nxt = soup.select_one(next_selector)
-                if nxt and nxt.get("href"):
-                    url = urljoin(url, nxt.get("href"))
+                href = self.parser.attr(self.parser.select_one(doc, next_selector), "href")
+                if href:
+                    url = urljoin(url, href)
                 else:
                     break
             else:
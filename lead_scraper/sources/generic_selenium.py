@@ -6,16 +6,35 @@ from typing import Dict, List, Callable
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from .selenium_utils import build_chrome, wait_css
-from ..utils import logger, sleep_random
+from .selenium_utils import CardSpec, DriverPool, extract_cards, shared_driver_pool, wait_css
+from ..ratelimit import RATE_LIMITER, RateLimiter, rate_for_delay
+from ..utils import logger
+
+# Common directory markup; "text" is the whole card for sites that match none of the selectors
+DEFAULT_CARD_SPEC: CardSpec = {
+    "name": {"css": "a, h3, h4"},
+    "website": {"css": "a[href^='http']", "attr": "href"},
+    "phone": {"css": ".phone, [data-phone], a[href^='tel:']"},
+    "address": {"css": "address, .address"},
+    "text": {"attr": "text"},
+}
 
 
 class GenericSeleniumScraper:
     name = "Generic Selenium"
+    uses_browser = True
 
-    def __init__(self, headless: bool = True, delay_seconds: float = 1.0) -> None:
+    def __init__(
+        self,
+        headless: bool = True,
+        delay_seconds: float = 1.0,
+        rate_limiter: RateLimiter | None = None,
+        driver_pool: DriverPool | None = None,
+    ) -> None:
         self.headless = headless
+        self.driver_pool = driver_pool or shared_driver_pool(headless)
         self.delay_seconds = delay_seconds
+        self.rate_limiter = rate_limiter or RATE_LIMITER
 
     def search(
         self,
@@ -24,42 +43,66 @@ class GenericSeleniumScraper:
         parse_card: Callable[[object], Dict[str, str]],
         next_button_css: str | None = None,
         max_pages: int = 3,
+        card_spec: CardSpec | None = None,
+        stop_flag: Callable[[], bool] | None = None,
+    ) -> List[Dict[str, str]]:
+        """Collect cards from `start_url` onwards.
+
+        Without `card_spec`, `parse_card` gets each card's WebElement. With it, every
+        card on a page is read in one script call and `parse_card` gets a dict of the
+        spec's fields, which avoids a WebDriver round trip per field.
+        """
+        with self.driver_pool.lease() as driver:
+            return self._search(driver, start_url, locate_cards_css, parse_card, next_button_css, max_pages, card_spec, stop_flag)
+
+    def _search(
+        self,
+        driver: WebDriver,
+        start_url: str,
+        locate_cards_css: str,
+        parse_card: Callable[[object], Dict[str, str]],
+        next_button_css: str | None,
+        max_pages: int,
+        card_spec: CardSpec | None = None,
+        stop_flag: Callable[[], bool] | None = None,
     ) -> List[Dict[str, str]]:
-        driver: WebDriver = build_chrome(headless=self.headless)
         rows: List[Dict[str, str]] = []
-        try:
-            url = start_url
-            for page in range(1, max_pages + 1):
-                logger.info(f"Navigating: {url}")
-                try:
-                    driver.get(url)
-                    wait_css(driver, locate_cards_css)
-                except Exception as e:
-                    logger.exception(f"Failed to load {url}: {e}")
-                    break
-                time.sleep(self.delay_seconds)
-                sleep_random(1.0, 5.0)
+        url = start_url
+        for page in range(1, max_pages + 1):
+            if stop_flag and stop_flag():
+                break
+            self.rate_limiter.acquire(url, rate=rate_for_delay(self.delay_seconds))
+            logger.info(f"Navigating: {url}")
+            try:
+                driver.get(url)
+                wait_css(driver, locate_cards_css)
+                self.driver_pool.count_page(driver, url)
+            except Exception as e:
+                logger.exception(f"Failed to load {url}: {e}")
+                break
 
+            if card_spec:
+                cards = extract_cards(driver, locate_cards_css, card_spec)
+            else:
                 cards = driver.find_elements(By.CSS_SELECTOR, locate_cards_css)
-                logger.info(f"Found {len(cards)} cards on {url}")
-                for card in cards:
-                    try:
-                        data = parse_card(card)
-                        if data.get("name"):
-                            rows.append(data)
-                    except Exception as e:
-                        logger.warning(f"Card parse error on {url}: {e}")
-
-                if not next_button_css:
-                    break
+            logger.info(f"Found {len(cards)} cards on {url}")
+            for card in cards:
                 try:
-                    nxt = driver.find_element(By.CSS_SELECTOR, next_button_css)
-                    driver.execute_script("arguments[0].click();", nxt)
-                    time.sleep(self.delay_seconds)
-                    sleep_random(1.0, 5.0)
-                    url = driver.current_url
-                except Exception:
-                    break
-        finally:
-            driver.quit()
+                    data = parse_card(card)
+                    if data.get("name"):
+                        rows.append(data)
+                except Exception as e:
+                    logger.warning(f"Card parse error on {url}: {e}")
+
+            if not next_button_css:
+                break
+            try:
+                nxt = driver.find_element(By.CSS_SELECTOR, next_button_css)
+                self.rate_limiter.acquire(url, rate=rate_for_delay(self.delay_seconds))
+                driver.execute_script("arguments[0].click();", nxt)
+                # Give the click time to navigate before reading current_url
+                time.sleep(self.delay_seconds)
+                url = driver.current_url
+            except Exception:
+                break
         return rows
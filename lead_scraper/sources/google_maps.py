@@ -1,24 +1,44 @@
 from __future__ import annotations
 
+import queue
 import time
 import urllib.parse
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
-from .selenium_utils import build_chrome, wait_css
-from ..utils import logger, sleep_random
+from .selenium_utils import DriverPool, shared_driver_pool, wait_css
+from ..ratelimit import RATE_LIMITER, RateLimiter, rate_for_delay
+from ..utils import logger
 
 
 class GoogleMapsScraper:
     name = "Google Maps"
+    uses_browser = True
 
-    def __init__(self, headless: bool = True, delay_seconds: float = 1.0) -> None:
+    def __init__(
+        self,
+        headless: bool = True,
+        delay_seconds: float = 1.0,
+        rate_limiter: RateLimiter | None = None,
+        driver_pool: DriverPool | None = None,
+        detail_workers: int = 1,
+    ) -> None:
         self.headless = headless
+        # detail_workers > 1 opens place pages on that many pooled drivers instead of clicking cards one by one
+        self.detail_workers = max(1, detail_workers)
+        self.driver_pool = driver_pool or shared_driver_pool(headless, size=self.detail_workers)
+        # Settle time for lazily loaded content; request pacing is done by the rate limiter
         self.delay_seconds = delay_seconds
+        self.rate_limiter = rate_limiter or RATE_LIMITER
+
+    def _throttle(self) -> None:
+        # Scrolls and card clicks each trigger requests to the Maps backend
+        self.rate_limiter.acquire("https://www.google.com/maps", rate=rate_for_delay(self.delay_seconds))
 
     def build_search_url(self, keyword: str, location: str) -> str:
         q = urllib.parse.quote_plus(f"{keyword} in {location}")
@@ -44,16 +64,18 @@ class GoogleMapsScraper:
             except Exception:
                 continue
 
-    def _scroll_results(self, driver: WebDriver, feed, rounds: int) -> None:
+    def _scroll_results(self, driver: WebDriver, feed, rounds: int, stop_flag: Callable[[], bool] | None = None) -> None:
         # Use JS scrollTop and END key presses to load more results
         for i in range(rounds):
+            if stop_flag and stop_flag():
+                return
+            self._throttle()
             driver.execute_script("arguments[0].scrollTop = arguments[0].scrollTop + arguments[0].offsetHeight;", feed)
             try:
                 feed.send_keys(Keys.END)
             except Exception:
                 pass
             time.sleep(self.delay_seconds)
-            sleep_random(1.0, 2.0)
             cards = driver.find_elements(By.CSS_SELECTOR, "div[role='feed'] .Nv2PK")
             logger.info(f"Scroll {i+1}/{rounds}: {len(cards)} cards visible")
 
@@ -78,56 +100,81 @@ class GoogleMapsScraper:
             pass
         return {"website": website, "phone": phone, "address": address}
 
-    def search(self, keyword: str, location: str, max_pages: int = 3) -> List[Dict[str, str]]:
-        driver: WebDriver = build_chrome(headless=self.headless)
-        rows: List[Dict[str, str]] = []
+    def search(self, keyword: str, location: str, max_pages: int = 3, stop_flag: Callable[[], bool] | None = None) -> List[Dict[str, str]]:
+        if self.detail_workers <= 1:
+            with self.driver_pool.lease() as driver:
+                return self._search(driver, keyword, location, max_pages, stop_flag)
+        # The feed driver goes back to the pool before the detail workers lease theirs
+        with self.driver_pool.lease() as driver:
+            places = self._collect_places(driver, keyword, location, max_pages, stop_flag)
+        rows = self._resolve_places(places, stop_flag)
+        logger.info(f"Google Maps collected {len(rows)} results")
+        return rows
+
+    def _load_cards(self, driver: WebDriver, keyword: str, location: str, max_pages: int, stop_flag: Callable[[], bool] | None = None) -> list:
+        url = self.build_search_url(keyword, location)
+        self._throttle()
+        logger.info(f"Navigating: {url}")
         try:
-            url = self.build_search_url(keyword, location)
-            logger.info(f"Navigating: {url}")
-            try:
-                driver.get(url)
-                # Consent banner if present
-                time.sleep(1.0)
-                self._handle_consent(driver)
-                wait_css(driver, "div[role='feed']")
-            except TimeoutException as e:
-                logger.exception(f"Failed to load results container: {e}")
-                return rows
-            except Exception as e:
-                logger.exception(f"Failed to load {url}: {e}")
-                return rows
+            driver.get(url)
+            # Consent banner if present
+            time.sleep(1.0)
+            self._handle_consent(driver)
+            wait_css(driver, "div[role='feed']")
+            self.driver_pool.count_page(driver, url)
+        except TimeoutException as e:
+            logger.exception(f"Failed to load results container: {e}")
+            return []
+        except Exception as e:
+            logger.exception(f"Failed to load {url}: {e}")
+            return []
 
-            time.sleep(self.delay_seconds)
-            sleep_random(1.0, 2.0)
+        feed = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
+        # Try to load more by multiple scrolls
+        self._scroll_results(driver, feed, rounds=max_pages * 5, stop_flag=stop_flag)
 
-            feed = driver.find_element(By.CSS_SELECTOR, "div[role='feed']")
-            # Try to load more by multiple scrolls
-            self._scroll_results(driver, feed, rounds=max_pages * 5)
+        # Use more stable selector for cards
+        cards = driver.find_elements(By.CSS_SELECTOR, "div[role='feed'] .Nv2PK")
+        if not cards:
+            logger.info("No result cards found after scrolling. Try disabling headless mode or adjust keyword/location.")
+        return cards
 
-            # Use more stable selector for cards
-            cards = driver.find_elements(By.CSS_SELECTOR, "div[role='feed'] .Nv2PK")
-            if not cards:
-                logger.info("No result cards found after scrolling. Try disabling headless mode or adjust keyword/location.")
-                return rows
+    @staticmethod
+    def _card_name(card) -> str:
+        try:
+            return card.find_element(By.CSS_SELECTOR, ".qBF1Pd").text.strip()
+        except NoSuchElementException:
+            try:
+                return card.find_element(By.CSS_SELECTOR, "a.hfpxzc").get_attribute("aria-label") or ""
+            except Exception:
+                return ""
 
+    @staticmethod
+    def _row(name: str, details: Dict[str, str]) -> Dict[str, str]:
+        return {
+            "name": name,
+            "website": details.get("website", ""),
+            "email": "",
+            "phone": details.get("phone", ""),
+            "address": details.get("address", ""),
+            "socials": "",
+        }
+
+    def _search(self, driver: WebDriver, keyword: str, location: str, max_pages: int, stop_flag: Callable[[], bool] | None = None) -> List[Dict[str, str]]:
+        rows: List[Dict[str, str]] = []
+        try:
+            cards = self._load_cards(driver, keyword, location, max_pages, stop_flag)
             seen_names = set()
-            for idx, card in enumerate(cards, start=1):
-                # Extract name from card list
-                name = ""
-                try:
-                    name_el = card.find_element(By.CSS_SELECTOR, ".qBF1Pd")
-                    name = name_el.text.strip()
-                except NoSuchElementException:
-                    try:
-                        name_el = card.find_element(By.CSS_SELECTOR, "a.hfpxzc")
-                        name = name_el.get_attribute("aria-label") or ""
-                    except Exception:
-                        name = ""
+            for card in cards:
+                if stop_flag and stop_flag():
+                    break
+                name = self._card_name(card)
                 if not name or name in seen_names:
                     continue
                 seen_names.add(name)
 
                 # Open details panel by clicking the card title link if available, else the card container
+                self._throttle()
                 try:
                     link = card.find_element(By.CSS_SELECTOR, "a.hfpxzc")
                     driver.execute_script("arguments[0].click();", link)
@@ -138,26 +185,72 @@ class GoogleMapsScraper:
                         continue
 
                 time.sleep(self.delay_seconds)
-                sleep_random(0.8, 1.5)
                 try:
                     wait_css(driver, "div[role='main']")
                 except TimeoutException:
                     pass
 
-                details = self._extract_details_panel(driver)
-                rows.append({
-                    "name": name,
-                    "website": details.get("website", ""),
-                    "email": "",
-                    "phone": details.get("phone", ""),
-                    "address": details.get("address", ""),
-                    "socials": "",
-                })
-
-                # Short pause between cards to reduce blocking
-                time.sleep(self.delay_seconds)
-                sleep_random(0.5, 1.2)
+                rows.append(self._row(name, self._extract_details_panel(driver)))
         finally:
             logger.info(f"Google Maps collected {len(rows)} results")
-            driver.quit()
         return rows
+
+    def _collect_places(self, driver: WebDriver, keyword: str, location: str, max_pages: int, stop_flag: Callable[[], bool] | None = None) -> List[Tuple[str, str]]:
+        """Return (name, place URL) for every distinct result in the feed."""
+        places: List[Tuple[str, str]] = []
+        seen_names = set()
+        for card in self._load_cards(driver, keyword, location, max_pages, stop_flag):
+            name = self._card_name(card)
+            if not name or name in seen_names:
+                continue
+            seen_names.add(name)
+            try:
+                href = card.find_element(By.CSS_SELECTOR, "a.hfpxzc").get_attribute("href") or ""
+            except Exception:
+                href = ""
+            places.append((name, href))
+        logger.info(f"Google Maps: resolving {len(places)} places with {self.detail_workers} workers")
+        return places
+
+    def _resolve_place(self, driver: WebDriver, href: str) -> Dict[str, str]:
+        self._throttle()
+        try:
+            driver.get(href)
+            if "consent." in driver.current_url:
+                self._handle_consent(driver)
+            wait_css(driver, "button[data-item-id='address'], a[data-item-id]", timeout=10)
+        except TimeoutException:
+            # Some places have no address or links; read whatever the panel has
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load place {href}: {e}")
+            return {}
+        self.driver_pool.count_page(driver, href)
+        return self._extract_details_panel(driver)
+
+    def _resolve_places(self, places: List[Tuple[str, str]], stop_flag: Callable[[], bool] | None = None) -> List[Dict[str, str]]:
+        details: List[Dict[str, str]] = [{} for _ in places]
+        todo: "queue.Queue[int]" = queue.Queue()
+        for idx, (_, href) in enumerate(places):
+            if href:
+                todo.put(idx)
+
+        def work() -> None:
+            # A lease per place, so the pool can recycle a grown Chrome between places
+            while not (stop_flag and stop_flag()):
+                try:
+                    idx = todo.get_nowait()
+                except queue.Empty:
+                    return
+                with self.driver_pool.lease() as driver:
+                    details[idx] = self._resolve_place(driver, places[idx][1])
+
+        workers = min(self.detail_workers, todo.qsize())
+        if workers:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gmaps-detail") as pool:
+                for fut in [pool.submit(work) for _ in range(workers)]:
+                    try:
+                        fut.result()
+                    except Exception as e:
+                        logger.exception(f"Google Maps detail worker failed: {e}")
+        return [self._row(name, d) for (name, _), d in zip(places, details)]
@@ -1,6 +1,11 @@
 from __future__ import annotations
 
-from typing import Optional
+import atexit
+import contextlib
+import functools
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options as ChromeOptions
@@ -13,7 +18,47 @@ from webdriver_manager.chrome import ChromeDriverManager
 from ..utils import get_random_user_agent, logger
 
 
-def build_chrome(headless: bool = True) -> webdriver.Chrome:
+try:
+    import psutil
+except ImportError:  # optional: without it drivers are only recycled by page count
+    psutil = None
+
+
+@functools.lru_cache(maxsize=1)
+def chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process instead of on every launch."""
+    return ChromeDriverManager().install()
+
+
+# URL patterns (Chrome's Network.setBlockedURLs wildcard syntax) per blockable resource type
+RESOURCE_PATTERNS: Dict[str, List[str]] = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*"],
+    "stylesheet": ["*.css*"],
+    "tracker": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*facebook.net*", "*hotjar.com*", "*segment.io*",
+        "*scorecardresearch.com*", "*adsystem.com*",
+    ],
+}
+# Stylesheets stay on by default: the Maps feed is scrolled by its laid-out height
+LEAN_BLOCK_TYPES = ("image", "font", "media", "tracker")
+
+
+def build_chrome(
+    headless: bool = True,
+    lean: bool = False,
+    block_types: Iterable[str] | None = None,
+    block_patterns: Iterable[str] = (),
+    page_load_strategy: str | None = None,
+) -> webdriver.Chrome:
+    """Launch Chrome.
+
+    `lean=True` blocks LEAN_BLOCK_TYPES (or `block_types`) plus any extra
+    `block_patterns`, and switches to the "eager" page-load strategy so `get()`
+    returns at DOMContentLoaded instead of waiting for every subresource.
+    """
     options = ChromeOptions()
     if headless:
         options.add_argument("--headless=new")
@@ -23,13 +68,283 @@ def build_chrome(headless: bool = True) -> webdriver.Chrome:
     options.add_argument("--window-size=1280,1000")
     options.add_argument("--lang=en-US")
     options.add_argument(f"--user-agent={get_random_user_agent()}")
-    service = ChromeService(ChromeDriverManager().install())
+    blocked: List[str] = list(block_patterns)
+    if lean:
+        types = LEAN_BLOCK_TYPES if block_types is None else tuple(block_types)
+        for kind in types:
+            blocked.extend(RESOURCE_PATTERNS.get(kind, []))
+        if "image" in types:
+            # Content settings also stop images that are not fetched by URL (CSS, srcset)
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        page_load_strategy = page_load_strategy or "eager"
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+    service = ChromeService(chromedriver_path())
     driver = webdriver.Chrome(service=service, options=options)
     driver.set_page_load_timeout(40)
-    logger.info("Launched Chrome WebDriver")
+    if blocked:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        except Exception as e:
+            logger.warning(f"Could not enable resource blocking: {e}")
+    logger.info(f"Launched Chrome WebDriver (lean={lean}, blocked patterns={len(blocked)})")
     return driver
 
 
+_PAGE_BYTES_JS = """
+const entries = performance.getEntriesByType("navigation").concat(performance.getEntriesByType("resource"));
+let total = 0;
+for (const e of entries) total += e.transferSize || 0;
+return total;
+"""
+
+
+def page_bytes(driver: webdriver.Chrome) -> int:
+    """Bytes transferred for the current page per the Resource Timing API.
+
+    Cross-origin responses without Timing-Allow-Origin report 0, so this is a lower
+    bound, but it is consistent enough to compare lean and full profiles.
+    """
+    try:
+        return int(driver.execute_script(_PAGE_BYTES_JS) or 0)
+    except Exception:
+        return 0
+
+
+def driver_rss_mb(driver: webdriver.Chrome) -> Optional[float]:
+    """Resident memory of chromedriver plus every Chrome process it started, or None if unknown."""
+    if psutil is None:
+        return None
+    try:
+        root = psutil.Process(driver.service.process.pid)
+        procs = [root] + root.children(recursive=True)
+    except Exception:
+        return None
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def _quit(driver: webdriver.Chrome) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"Error closing Chrome WebDriver: {e}")
+
+
+class _PooledDriver:
+    def __init__(self, driver: webdriver.Chrome) -> None:
+        self.driver = driver
+        self.pages = 0
+
+
+class DriverPool:
+    """Keeps warm Chrome instances and lends them out one job at a time.
+
+    At most `size` drivers exist at once; `lease()` blocks until one is free. A driver
+    is quit instead of returned once it has loaded `max_pages` pages or its process
+    tree uses more than `max_rss_mb` (the RSS check needs the optional `psutil`).
+    Drivers are launched with build_chrome's lean profile unless `lean=False`, and
+    `stats()` reports the bytes transferred per page recorded by `count_page`.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        headless: bool = True,
+        max_pages: int = 50,
+        max_rss_mb: float = 1500.0,
+        lean: bool = True,
+        block_types: Iterable[str] | None = None,
+        block_patterns: Iterable[str] = (),
+    ) -> None:
+        self.size = max(1, size)
+        self.headless = headless
+        self.lean = lean
+        self.block_types = block_types
+        self.block_patterns = tuple(block_patterns)
+        self.pages_loaded = 0
+        self.bytes_loaded = 0
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._lock = threading.Lock()
+        self._free = threading.Condition(self._lock)
+        self._out = 0
+        self._idle: List[_PooledDriver] = []
+        self._leased: Dict[int, _PooledDriver] = {}
+        self._closed = False
+
+    def _acquire(self) -> _PooledDriver:
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+            if entry is None:
+                started = time.monotonic()
+                entry = _PooledDriver(build_chrome(
+                    headless=self.headless,
+                    lean=self.lean,
+                    block_types=self.block_types,
+                    block_patterns=self.block_patterns,
+                ))
+                logger.info(f"Driver pool: started Chrome in {time.monotonic() - started:.1f}s")
+                return entry
+            try:
+                # A crashed browser raises here; replace it rather than hand it out
+                entry.driver.current_url
+                return entry
+            except Exception:
+                logger.warning("Driver pool: discarding unresponsive Chrome")
+                _quit(entry.driver)
+
+    def _should_recycle(self, entry: _PooledDriver) -> bool:
+        if self.max_pages and entry.pages >= self.max_pages:
+            logger.info(f"Driver pool: recycling Chrome after {entry.pages} pages")
+            return True
+        rss = driver_rss_mb(entry.driver) if self.max_rss_mb else None
+        if rss is not None and rss > self.max_rss_mb:
+            logger.info(f"Driver pool: recycling Chrome at {rss:.0f} MB RSS")
+            return True
+        return False
+
+    def _release(self, entry: _PooledDriver) -> None:
+        with self._lock:
+            closed = self._closed
+        if closed or self._should_recycle(entry):
+            _quit(entry.driver)
+            return
+        try:
+            # Stop whatever the last page was doing while the driver sits idle
+            entry.driver.get("about:blank")
+        except Exception:
+            _quit(entry.driver)
+            return
+        with self._lock:
+            self._idle.append(entry)
+
+    def ensure_size(self, size: int) -> None:
+        """Grow the pool to at least `size` drivers; it never shrinks."""
+        with self._free:
+            if size > self.size:
+                self.size = size
+                self._free.notify_all()
+
+    def _return_slot(self) -> None:
+        with self._free:
+            self._out -= 1
+            self._free.notify()
+
+    @contextlib.contextmanager
+    def lease(self) -> Iterator[webdriver.Chrome]:
+        with self._free:
+            while self._out >= self.size:
+                self._free.wait()
+            self._out += 1
+        try:
+            entry = self._acquire()
+        except Exception:
+            self._return_slot()
+            raise
+        with self._lock:
+            self._leased[id(entry.driver)] = entry
+        try:
+            yield entry.driver
+        finally:
+            with self._lock:
+                self._leased.pop(id(entry.driver), None)
+            try:
+                self._release(entry)
+            finally:
+                self._return_slot()
+
+    def count_page(self, driver: webdriver.Chrome, url: str = "") -> None:
+        """Record a loaded page on a leased driver, for recycling and page-weight stats."""
+        size = page_bytes(driver)
+        logger.info(f"Page weight: {size / 1024:.0f} KiB for {url or 'current page'}")
+        with self._lock:
+            self.pages_loaded += 1
+            self.bytes_loaded += size
+            entry = self._leased.get(id(driver))
+            if entry is not None:
+                entry.pages += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "pages": self.pages_loaded,
+                "bytes": self.bytes_loaded,
+                "avg_bytes": self.bytes_loaded // self.pages_loaded if self.pages_loaded else 0,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for entry in idle:
+            _quit(entry.driver)
+
+
+_shared_pools: Dict[bool, DriverPool] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_driver_pool(headless: bool = True, size: int = 0) -> DriverPool:
+    """Process-wide pool per headless mode, so drivers stay warm between jobs."""
+    with _shared_lock:
+        pool = _shared_pools.get(headless)
+        if pool is None:
+            pool = _shared_pools[headless] = DriverPool(headless=headless)
+            atexit.register(pool.close)
+    pool.ensure_size(size)
+    return pool
+
+
+# field name -> {"css": selector} or {"xpath": expression}, plus "attr": "text" (default)
+# or an attribute/property name such as "href". A field without a selector reads the card itself.
+CardSpec = Dict[str, Dict[str, str]]
+
+_EXTRACT_CARDS_JS = """
+const cards = document.querySelectorAll(arguments[0]);
+const spec = arguments[1];
+const read = (el, attr) => {
+    if (!el) return "";
+    if (attr === "text") return (el.innerText || el.textContent || "").trim();
+    // Prefer the property so hrefs come back absolute, as WebElement.get_attribute does
+    const prop = el[attr];
+    const value = typeof prop === "string" ? prop : el.getAttribute(attr);
+    return (value || "").trim();
+};
+const out = [];
+for (const card of cards) {
+    const row = {};
+    for (const [field, rule] of Object.entries(spec)) {
+        let el = card;
+        try {
+            if (rule.css) {
+                el = card.querySelector(rule.css);
+            } else if (rule.xpath) {
+                el = document.evaluate(rule.xpath, card, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            }
+        } catch (e) {
+            el = null;
+        }
+        row[field] = read(el, rule.attr || "text");
+    }
+    out.push(row);
+}
+return out;
+"""
+
+
+def extract_cards(driver: webdriver.Chrome, cards_css: str, spec: CardSpec) -> List[Dict[str, str]]:
+    """Read every card matching `cards_css` in one browser round trip."""
+    return driver.execute_script(_EXTRACT_CARDS_JS, cards_css, spec) or []
+
+
 def wait_css(driver: webdriver.Chrome, selector: str, timeout: int = 20):
     return WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
 
@@ -3,41 +3,38 @@ from __future__ import annotations
 import urllib.parse
 from typing import Dict, List
 
-from bs4 import BeautifulSoup
-
 from .base import BaseDirectoryScraper
+from ..parsing import Node
 from ..utils import normalize_space
 
 
 class YellowPagesScraper(BaseDirectoryScraper):
     name = "Yellow Pages"
+    parse_scope = ("div.search-results", "div.pagination")
 
     def build_search_url(self, keyword: str, location: str, page: int) -> str:
         q = urllib.parse.quote_plus(keyword)
         loc = urllib.parse.quote_plus(location)
         return f"https://www.yellowpages.com/search?search_terms={q}&geo_location_terms={loc}&page={page}"
 
-    def parse_search_results(self, soup: BeautifulSoup) -> List[Dict[str, str]]:
+    def parse_search_results(self, doc: Node) -> List[Dict[str, str]]:
+        p = self.parser
         rows: List[Dict[str, str]] = []
         # YellowPages commonly uses 'div.result' or 'div.result-list clearfix'
-        cards = soup.select("div.result, div.v-card")
+        cards = p.select(doc, "div.result, div.v-card")
         for c in cards:
             # Skip ads
-            if c.select_one(".ad, .ad-label, .adBadge"):
+            if p.select_one(c, ".ad, .ad-label, .adBadge") is not None:
                 continue
-            name_el = c.select_one("a.business-name, a.track-visit-website[aria-label]")
-            if not name_el:
-                name_el = c.select_one("a.business-name")
-            name = normalize_space(name_el.get_text(" ")) if name_el else ""
-
-            website_el = c.select_one("a.track-visit-website, a.website-link")
-            website = website_el.get("href") if website_el else ""
-            phone_el = c.select_one(".phones, .phone, .dish-phone")
-            phone = normalize_space(phone_el.get_text(" ")) if phone_el else ""
-            addr_el = c.select_one(".street-address")
-            locality_el = c.select_one(".locality")
+            name_el = p.select_one(c, "a.business-name, a.track-visit-website[aria-label]")
+            if name_el is None:
+                name_el = p.select_one(c, "a.business-name")
+            name = p.text(name_el)
+
+            website = p.attr(p.select_one(c, "a.track-visit-website, a.website-link"), "href")
+            phone = p.text(p.select_one(c, ".phones, .phone, .dish-phone"))
             address = normalize_space(
-                f"{addr_el.get_text(' ') if addr_el else ''} {locality_el.get_text(' ') if locality_el else ''}"
+                f"{p.text(p.select_one(c, '.street-address'))} {p.text(p.select_one(c, '.locality'))}"
             )
 
             if not name:
@@ -53,6 +50,5 @@ class YellowPagesScraper(BaseDirectoryScraper):
             })
         return rows
 
-    def has_next_page(self, soup: BeautifulSoup, page: int) -> bool:
-        next_el = soup.select_one("a.next, a.pagination .next")
-        return bool(next_el)
+    def has_next_page(self, doc: Node, page: int) -> bool:
+        return self.parser.select_one(doc, "a.next, a.pagination .next") is not None
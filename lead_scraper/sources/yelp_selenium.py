@@ -1,22 +1,38 @@
 from __future__ import annotations
 
-import time
 import urllib.parse
-from typing import Dict, List
+from typing import Callable, Dict, List
 
-from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from .selenium_utils import build_chrome, wait_css
-from ..utils import logger, sleep_random
+from .selenium_utils import CardSpec, DriverPool, extract_cards, shared_driver_pool, wait_css
+from ..ratelimit import RATE_LIMITER, RateLimiter, rate_for_delay
+from ..utils import logger
 
 
 class YelpSeleniumScraper:
     name = "Yelp (Selenium)"
+    uses_browser = True
 
-    def __init__(self, headless: bool = True, delay_seconds: float = 1.0) -> None:
+    CARDS_CSS = "main ul li div.container__09f24__mpR8_"
+    CARD_SPEC: CardSpec = {
+        "name": {"css": "a.css-1m051bw, a.css-19v1rkv"},
+        "website": {"xpath": ".//a[translate(text(),'WEBSITE','website')='website']", "attr": "href"},
+        "phone": {"css": "p.css-1p9ibgf"},
+        "address": {"css": "address"},
+    }
+
+    def __init__(
+        self,
+        headless: bool = True,
+        delay_seconds: float = 1.0,
+        rate_limiter: RateLimiter | None = None,
+        driver_pool: DriverPool | None = None,
+    ) -> None:
         self.headless = headless
+        self.driver_pool = driver_pool or shared_driver_pool(headless)
         self.delay_seconds = delay_seconds
+        self.rate_limiter = rate_limiter or RATE_LIMITER
 
     def build_search_url(self, keyword: str, location: str, page: int) -> str:
         q = urllib.parse.quote_plus(keyword)
@@ -24,57 +40,45 @@ class YelpSeleniumScraper:
         start = (page - 1) * 10
         return f"https://www.yelp.com/search?find_desc={q}&find_loc={loc}&start={start}"
 
-    def search(self, keyword: str, location: str, max_pages: int = 3) -> List[Dict[str, str]]:
-        driver: WebDriver = build_chrome(headless=self.headless)
+    def search(
+        self, keyword: str, location: str, max_pages: int = 3, stop_flag: Callable[[], bool] | None = None
+    ) -> List[Dict[str, str]]:
+        with self.driver_pool.lease() as driver:
+            return self._search(driver, keyword, location, max_pages, stop_flag)
+
+    def _search(
+        self, driver: WebDriver, keyword: str, location: str, max_pages: int, stop_flag: Callable[[], bool] | None = None
+    ) -> List[Dict[str, str]]:
         rows: List[Dict[str, str]] = []
-        try:
-            for page in range(1, max_pages + 1):
-                url = self.build_search_url(keyword, location, page)
-                logger.info(f"Navigating: {url}")
-                try:
-                    driver.get(url)
-                    wait_css(driver, "main ul")
-                except Exception as e:
-                    logger.exception(f"Failed to load {url}: {e}")
-                    continue
-                time.sleep(self.delay_seconds)
-                sleep_random(1.0, 3.0)
+        for page in range(1, max_pages + 1):
+            if stop_flag and stop_flag():
+                break
+            url = self.build_search_url(keyword, location, page)
+            self.rate_limiter.acquire(url, rate=rate_for_delay(self.delay_seconds))
+            logger.info(f"Navigating: {url}")
+            try:
+                driver.get(url)
+                wait_css(driver, "main ul")
+                self.driver_pool.count_page(driver, url)
+            except Exception as e:
+                logger.exception(f"Failed to load {url}: {e}")
+                continue
 
-                cards = driver.find_elements(By.CSS_SELECTOR, "main ul li div.container__09f24__mpR8_")
-                logger.info(f"Found {len(cards)} cards on {url}")
-                if not cards:
-                    break
-                for card in cards:
-                    try:
-                        name = card.find_element(By.CSS_SELECTOR, "a.css-1m051bw, a.css-19v1rkv").text.strip()
-                    except Exception:
-                        continue
-                    website = ""
-                    try:
-                        website_link = card.find_element(By.XPATH, ".//a[translate(text(),'WEBSITE','website')='website']")
-                        website = website_link.get_attribute("href") or ""
-                    except Exception:
-                        pass
-                    phone = ""
-                    try:
-                        phone = card.find_element(By.CSS_SELECTOR, "p.css-1p9ibgf").text.strip()
-                    except Exception:
-                        pass
-                    address = ""
-                    try:
-                        address = card.find_element(By.CSS_SELECTOR, "address").text.strip()
-                    except Exception:
-                        pass
-                    rows.append({
-                        "name": name,
-                        "website": website,
-                        "email": "",
-                        "phone": phone,
-                        "address": address,
-                        "socials": "",
-                    })
-                if len(cards) < 5:
-                    break
-        finally:
-            driver.quit()
+            cards = extract_cards(driver, self.CARDS_CSS, self.CARD_SPEC)
+            logger.info(f"Found {len(cards)} cards on {url}")
+            if not cards:
+                break
+            for card in cards:
+                if not card.get("name"):
+                    continue
+                rows.append({
+                    "name": card["name"],
+                    "website": card.get("website", ""),
+                    "email": "",
+                    "phone": card.get("phone", ""),
+                    "address": card.get("address", ""),
+                    "socials": "",
+                })
+            if len(cards) < 5:
+                break
         return rows
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .utils import domain_from_url, key_phone, lead_id, logger
+
+LEAD_FIELDS = ["name", "website", "email", "phone", "address", "socials", "source", "score", "status", "notes"]
+_ORDERS = {"added": "rowid", "score": "score DESC, rowid", "name": "name COLLATE NOCASE, rowid"}
+
+
+class LeadStore:
+    """Leads in a local SQLite database shared by the desktop and web apps.
+
+    The database runs in WAL mode, so exports and dashboards can read while a scrape
+    is writing. Every thread reads through its own connection and writes go through
+    one connection as batched upserts. Leads are keyed by `utils.lead_id`, so later,
+    enriched copies of a row update the same record. A lead belongs to every run
+    that produced it (the `lead_runs` table), so scrapes running at the same time
+    don't take each other's leads; the `run` column only records the latest one.
+    """
+
+    def __init__(self, path: str = os.path.join(".cache", "leads.db")) -> None:
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._db = self._connect()
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS leads (
+                id TEXT PRIMARY KEY,
+                run TEXT NOT NULL,
+                name TEXT NOT NULL DEFAULT '',
+                website TEXT NOT NULL DEFAULT '',
+                email TEXT NOT NULL DEFAULT '',
+                phone TEXT NOT NULL DEFAULT '',
+                address TEXT NOT NULL DEFAULT '',
+                socials TEXT NOT NULL DEFAULT '',
+                source TEXT NOT NULL DEFAULT '',
+                score INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'New',
+                notes TEXT NOT NULL DEFAULT '',
+                domain TEXT NOT NULL DEFAULT '',
+                phone_key TEXT NOT NULL DEFAULT '',
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS leads_run ON leads (run);
+            CREATE INDEX IF NOT EXISTS leads_domain ON leads (domain);
+            CREATE INDEX IF NOT EXISTS leads_phone ON leads (phone_key);
+            CREATE INDEX IF NOT EXISTS leads_source ON leads (source);
+            CREATE INDEX IF NOT EXISTS leads_status ON leads (status);
+            CREATE INDEX IF NOT EXISTS leads_score ON leads (score);
+            CREATE TABLE IF NOT EXISTS lead_runs (
+                run TEXT NOT NULL,
+                id TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run, id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS lead_runs_updated ON lead_runs (run, updated_at, id);
+            """
+        )
+        # Databases from before lead_runs: each lead belongs to the run that last produced it
+        if self._db.execute("SELECT NOT EXISTS (SELECT 1 FROM lead_runs) AND EXISTS (SELECT 1 FROM leads)").fetchone()[0]:
+            self._db.execute("INSERT INTO lead_runs (run, id, updated_at) SELECT run, id, updated_at FROM leads")
+        self._db.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self._connect()
+            db.row_factory = sqlite3.Row
+        return db
+
+    @staticmethod
+    def new_run() -> str:
+        """A run id; ids sort in the order the runs started."""
+        return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+    def upsert(self, rows: Iterable[Dict[str, str]], run: str, batch_size: int = 500) -> int:
+        """Insert or update `rows` under `run`; returns the number of rows written."""
+        written = 0
+        batch: List[Tuple] = []
+        for row in rows:
+            ident = lead_id(row)
+            try:
+                score = int(row.get("score") or 0)
+            except (TypeError, ValueError):
+                score = 0
+            batch.append((
+                ident, run,
+                *(str(row.get(f) or "") for f in ("name", "website", "email", "phone", "address", "socials", "source")),
+                score, str(row.get("status") or "New"), str(row.get("notes") or ""),
+                domain_from_url((row.get("website") or "").lower().strip().rstrip("/")),
+                key_phone((row.get("phone") or "").split(",")[0]),
+            ))
+            if len(batch) >= batch_size:
+                written += self._write(batch)
+                batch = []
+        if batch:
+            written += self._write(batch)
+        return written
+
+    def _write(self, batch: List[Tuple]) -> int:
+        with self._lock:
+            # Stamped under the lock, so updated_at increases in commit order (see `changes`)
+            now = time.time()
+            self._db.executemany(
+                "INSERT INTO leads (id, run, name, website, email, phone, address, socials, source, score, status, notes, domain, phone_key, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET run = excluded.run, name = excluded.name, website = excluded.website, "
+                "email = excluded.email, phone = excluded.phone, address = excluded.address, socials = excluded.socials, "
+                "source = excluded.source, score = excluded.score, domain = excluded.domain, phone_key = excluded.phone_key, "
+                "updated_at = excluded.updated_at, "
+                # A rescraped lead comes back as "New"; keep the status and notes set by hand
+                "status = CASE WHEN excluded.status IN ('', 'New') THEN leads.status ELSE excluded.status END, "
+                "notes = CASE WHEN excluded.notes = '' THEN leads.notes ELSE excluded.notes END",
+                [(*row, now) for row in batch],
+            )
+            self._db.executemany(
+                "INSERT INTO lead_runs (run, id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(run, id) DO UPDATE SET updated_at = excluded.updated_at",
+                [(row[1], row[0], now) for row in batch],
+            )
+            self._db.commit()
+        return len(batch)
+
+    def update(self, ids: Iterable[str], **fields: str) -> int:
+        """Set `fields` (status, notes) on the leads with the given ids."""
+        unknown = set(fields) - {"status", "notes"}
+        if unknown:
+            raise ValueError(f"Cannot update {sorted(unknown)}")
+        ids = list(ids)
+        if not ids or not fields:
+            return 0
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        changed = 0
+        with self._lock:
+            now = time.time()
+            for i in range(0, len(ids), 900):  # stay under SQLite's bound-parameter limit
+                chunk = ids[i:i + 900]
+                marks = ",".join("?" * len(chunk))
+                cur = self._db.execute(
+                    f"UPDATE leads SET {assignments}, updated_at = ? WHERE id IN ({marks})",
+                    [*fields.values(), now, *chunk],
+                )
+                changed += cur.rowcount
+                # Every run showing these leads sees the edit as a change
+                self._db.execute(f"UPDATE lead_runs SET updated_at = ? WHERE id IN ({marks})", [now, *chunk])
+            self._db.commit()
+        return changed
+
+    @staticmethod
+    def _where(
+        run: Optional[str], source: Optional[str], status: Optional[str], domain: Optional[str],
+        phone: Optional[str], min_score: Optional[int],
+    ) -> Tuple[str, List]:
+        clauses: List[str] = []
+        params: List = []
+        if run:
+            clauses.append("id IN (SELECT id FROM lead_runs WHERE run = ?)")
+            params.append(run)
+        for column, value in (("source", source), ("status", status), ("domain", domain)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if phone:
+            clauses.append("phone_key = ?")
+            params.append(key_phone(phone))
+        if min_score is not None:
+            clauses.append("score >= ?")
+            params.append(min_score)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def rows(
+        self,
+        run: Optional[str] = None,
+        source: Optional[str] = None,
+        status: Optional[str] = None,
+        domain: Optional[str] = None,
+        phone: Optional[str] = None,
+        min_score: Optional[int] = None,
+        order: str = "added",
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> Iterator[Dict[str, str]]:
+        """Stream matching leads as dicts with `id` plus the usual lead fields."""
+        where, params = self._where(run, source, status, domain, phone, min_score)
+        sql = f"SELECT id, {', '.join(LEAD_FIELDS)} FROM leads{where} ORDER BY {_ORDERS[order]}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        cur = self._reader().execute(sql, params)
+        while True:
+            chunk = cur.fetchmany(500)
+            if not chunk:
+                return
+            for rec in chunk:
+                yield dict(rec)
+
+    def count(
+        self,
+        run: Optional[str] = None,
+        source: Optional[str] = None,
+        status: Optional[str] = None,
+        domain: Optional[str] = None,
+        phone: Optional[str] = None,
+        min_score: Optional[int] = None,
+    ) -> int:
+        if run and not (source or status or domain or phone) and min_score is None:
+            return self._reader().execute("SELECT COUNT(*) FROM lead_runs WHERE run = ?", (run,)).fetchone()[0]
+        where, params = self._where(run, source, status, domain, phone, min_score)
+        return self._reader().execute(f"SELECT COUNT(*) FROM leads{where}", params).fetchone()[0]
+
+    def get(self, lead_id: str) -> Optional[Dict[str, str]]:
+        rec = self._reader().execute(f"SELECT id, {', '.join(LEAD_FIELDS)} FROM leads WHERE id = ?", (lead_id,)).fetchone()
+        return dict(rec) if rec else None
+
+    def changes(
+        self, run: Optional[str], after: Optional[Tuple[float, str]] = None, limit: int = 500,
+    ) -> List[Dict[str, str]]:
+        """Leads added or updated after the cursor `after`, oldest change first.
+
+        Rows carry `updated_at`; pass (updated_at, id) of the last row back as `after`
+        to get the next changes. Rows stamped in one write share `updated_at`, so the
+        id breaks ties and a batch split across calls is not skipped.
+        """
+        columns = ", ".join(f"leads.{f}" for f in ["id", *LEAD_FIELDS])
+        if run:
+            # A lead's change time within a run is kept in lead_runs
+            source, stamp, params = "lead_runs r JOIN leads ON leads.id = r.id WHERE r.run = ?", "r", [run]
+        else:
+            source, stamp, params = "leads WHERE 1", "leads", []
+        sql = f"SELECT {columns}, {stamp}.updated_at FROM {source}"
+        if after is not None:
+            sql += f" AND ({stamp}.updated_at, {stamp}.id) > (?, ?)"
+            params += [after[0], after[1]]
+        sql += f" ORDER BY {stamp}.updated_at, {stamp}.id LIMIT ?"
+        return [dict(rec) for rec in self._reader().execute(sql, [*params, limit])]
+
+    def version(self, run: Optional[str] = None) -> str:
+        """Changes whenever a lead of `run` (or any lead) is added or updated."""
+        if run:
+            count, updated = self._reader().execute(
+                "SELECT COUNT(*), MAX(updated_at) FROM lead_runs WHERE run = ?", (run,)
+            ).fetchone()
+        else:
+            count, updated = self._reader().execute("SELECT COUNT(*), MAX(updated_at) FROM leads").fetchone()
+        return f"{count}-{updated or 0:.6f}"
+
+    def latest_run(self) -> Optional[str]:
+        # Run ids start with their timestamp, so the largest is the newest
+        return self._reader().execute("SELECT MAX(run) FROM lead_runs").fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM leads")
+            self._db.execute("DELETE FROM lead_runs")
+            self._db.commit()
+
+
+_default_store: Optional[LeadStore] = None
+_default_lock = threading.Lock()
+
+
+def default_lead_store() -> LeadStore:
+    """Process-wide store shared by the desktop and web apps."""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = LeadStore()
+            logger.info(f"Lead store at {_default_store.path}")
+        return _default_store
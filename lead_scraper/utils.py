@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import hashlib
 import logging
 import random
 import re
@@ -74,13 +76,54 @@ def normalize_phone(phone: str) -> str:
     return digits[:20]
 
 
+@functools.lru_cache(maxsize=65536)
 def domain_from_url(url: str) -> str:
+    # tldextract is slow per call and the same sites repeat across sources and runs
     if not url:
         return ""
     ext = tldextract.extract(url)
     return ext.registered_domain or ""
 
 
+_KEY_JUNK = re.compile(r"[^a-z0-9 ]+")
+
+
+def key_text(text: str) -> str:
+    text = (text or "").lower().replace("&", " and ")
+    return " ".join(_KEY_JUNK.sub(" ", text).split())
+
+
+def key_phone(phone: str) -> str:
+    digits = "".join(ch for ch in (phone or "") if ch.isdigit())
+    # Treat +1 555... and 555... as the same North American number
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    return digits
+
+
+def lead_key(row: Dict[str, str]) -> bytes:
+    """Stable 16-byte hash of a lead's normalised name, domain, phone and address."""
+    parts = (
+        key_text(row.get("name") or ""),
+        domain_from_url((row.get("website") or "").lower().strip().rstrip("/")),
+        key_phone(row.get("phone") or ""),
+        key_text(row.get("address") or ""),
+    )
+    return hashlib.blake2b("\x1f".join(parts).encode("utf-8"), digest_size=16).digest()
+
+
+def lead_id(row: Dict[str, str]) -> str:
+    """The lead's stable id, assigning it from `lead_key` the first time.
+
+    The id is fixed once set, so enriched or edited copies of the row (which may
+    change the identity fields) still refer to the same lead.
+    """
+    ident = row.get("id")
+    if not ident:
+        ident = row["id"] = lead_key(row).hex()
+    return ident
+
+
 def score_lead(row: Dict[str, str]) -> int:
     score = 0
     if (row.get("website") or "").strip():
@@ -99,16 +142,10 @@ def score_lead(row: Dict[str, str]) -> int:
 
 
 def deduplicate_records(rows: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    seen: set[tuple] = set()
+    seen: set[bytes] = set()
     unique: List[Dict[str, str]] = []
     for r in rows:
-        domain = domain_from_url((r.get("website") or "").lower().strip().rstrip("/"))
-        key = (
-            (r.get("name") or "").lower(),
-            domain,
-            (r.get("phone") or "").replace(" ", ""),
-            (r.get("address") or "").lower(),
-        )
+        key = lead_key(r)
         if key in seen:
             continue
         seen.add(key)
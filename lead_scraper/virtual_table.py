@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import queue
+import time
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .search_index import LeadIndex
+
+RowFilter = Callable[[Dict[str, str]], bool]
+
+
+class VirtualTable(ttk.Frame):
+    """A Treeview that only materialises the rows currently in view.
+
+    All rows live in a plain list; the tree holds one item per visible line
+    (a "slot") and scrolling rewrites the slots' values. Selection is kept on the
+    model, so it survives scrolling and filtering. `append` and `clear` may be
+    called from any thread: they are queued and applied on the Tk main thread in
+    batches every `batch_ms`, followed by a single redraw. With an `index`, rows
+    are indexed as they are applied and `set_query` filters through it.
+    """
+
+    def __init__(
+        self,
+        master,
+        columns: Sequence[Tuple[str, str, int]],
+        height: int = 18,
+        batch_ms: int = 50,
+        batch_budget: float = 0.03,
+        index: LeadIndex | None = None,
+    ) -> None:
+        super().__init__(master)
+        self.keys = [key for key, _, _ in columns]
+        self.batch_ms = batch_ms
+        self.batch_budget = batch_budget
+        self.index = index
+        self.tree = ttk.Treeview(self, columns=self.keys, show="headings", height=height, selectmode="extended")
+        for key, text, width in columns:
+            self.tree.heading(key, text=text)
+            self.tree.column(key, width=width, anchor=tk.W)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scroll)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self._rows: List[Dict[str, str]] = []
+        self._view: List[int] = []  # indexes into _rows that pass the filter
+        self._keep: Optional[Callable[[int], bool]] = None  # by position in _rows
+        self._selected: Set[int] = set()
+        self._top = 0
+        self._slots: List[str] = []
+        self._blank = [""] * len(self.keys)
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._rowheight = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+        self.tree.bind("<Prior>", lambda e: self._scroll_by(-len(self._slots)))
+        self.tree.bind("<Next>", lambda e: self._scroll_by(len(self._slots)))
+        self.tree.bind("<Control-a>", self._select_all)
+        self._set_slots(height)
+        self._after = self.after(self.batch_ms, self._drain)
+
+    # Thread-safe updates
+
+    def append(self, rows: Iterable[Dict[str, str]]) -> None:
+        self._pending.put(("append", list(rows)))
+
+    def clear(self) -> None:
+        self._pending.put(("clear", None))
+
+    def _drain(self) -> None:
+        deadline = time.perf_counter() + self.batch_budget
+        changed = False
+        while time.perf_counter() < deadline:
+            try:
+                op, rows = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+            if op == "clear":
+                self._rows, self._view, self._top = [], [], 0
+                self._selected.clear()
+                if self.index is not None:
+                    self.index.clear()
+            else:
+                start = len(self._rows)
+                self._rows.extend(rows)
+                if self.index is not None:
+                    self.index.add(rows)
+                keep = self._keep
+                self._view.extend(i for i in range(start, len(self._rows)) if keep is None or keep(i))
+        if changed:
+            self._render()
+        self._after = self.after(self.batch_ms, self._drain)
+
+    def destroy(self) -> None:
+        self.after_cancel(self._after)
+        super().destroy()
+
+    # Main-thread API
+
+    def set_filter(self, keep: Optional[RowFilter]) -> None:
+        """Show only the rows for which `keep(row)` is true; None shows all."""
+        self._keep = None if keep is None else (lambda i: keep(self._rows[i]))
+        self._view = [i for i, r in enumerate(self._rows) if keep is None or keep(r)]
+        self._top = 0
+        self._render()
+
+    def set_query(self, text: str = "", domain: str = "", business_email: bool = False) -> None:
+        """Filter through the index: text in name/website/email/phone/address, a
+        substring of the website, and rows with a business email (or none at all)."""
+        if self.index is None:
+            raise RuntimeError("set_query needs a table built with an index")
+        index = self.index
+        found = index.search(text, domain, business_email)
+        if found is None:
+            self._keep = None
+            self._view = list(range(len(self._rows)))
+        else:
+            self._keep = lambda i: index.matches(i, text, domain, business_email)
+            self._view = found
+        self._top = 0
+        self._render()
+
+    def refresh(self) -> None:
+        """Redraw after rows were edited in place."""
+        self._render()
+
+    def selected_rows(self) -> List[Dict[str, str]]:
+        return [self._rows[i] for i in sorted(self._selected)]
+
+    def selected_ids(self) -> List[str]:
+        """The `id` of each selected row, for rows that carry one."""
+        return [r["id"] for r in self.selected_rows() if r.get("id")]
+
+    @property
+    def rows(self) -> List[Dict[str, str]]:
+        return self._rows
+
+    def visible_count(self) -> int:
+        return len(self._view)
+
+    # Rendering
+
+    def _set_slots(self, count: int) -> None:
+        count = max(1, count)
+        while len(self._slots) < count:
+            self._slots.append(self.tree.insert("", tk.END, values=self._blank))
+        while len(self._slots) > count:
+            self.tree.delete(self._slots.pop())
+
+    def _render(self) -> None:
+        total = len(self._view)
+        shown = len(self._slots)
+        self._top = max(0, min(self._top, total - shown))
+        selected: List[str] = []
+        for k, iid in enumerate(self._slots):
+            pos = self._top + k
+            if pos >= total:
+                self.tree.detach(iid)
+                continue
+            idx = self._view[pos]
+            row = self._rows[idx]
+            self.tree.item(iid, values=[row.get(key, "") for key in self.keys])
+            self.tree.move(iid, "", k)
+            if idx in self._selected:
+                selected.append(iid)
+        self.tree.selection_set(selected)
+        if total <= shown:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self._top / total, (self._top + shown) / total)
+
+    def _scroll_by(self, lines: int) -> str:
+        self._top += lines
+        self._render()
+        return "break"
+
+    # Events
+
+    def _on_configure(self, event) -> None:
+        # The heading takes about one row
+        wanted = max(1, event.height // self._rowheight - 1)
+        if wanted != len(self._slots):
+            self._set_slots(wanted)
+            self._render()
+
+    def _on_scroll(self, *args) -> None:
+        if args[0] == "moveto":
+            self._top = int(float(args[1]) * len(self._view))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            self._top += step * len(self._slots) if args[2] == "pages" else step
+        self._render()
+
+    def _on_wheel(self, event) -> str:
+        # Windows reports multiples of 120, macOS small deltas
+        step = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self._scroll_by(-3 * (step or (1 if event.delta > 0 else -1)))
+
+    def _on_click(self, event) -> None:
+        # A plain click on a row replaces the selection, including rows scrolled out of view
+        if self.tree.identify_region(event.x, event.y) not in ("cell", "tree"):
+            return
+        if not event.state & 0x0005:  # Shift or Control
+            self._selected.clear()
+
+    def _on_select(self, _event) -> None:
+        # Sync the model with the slots in view; rows outside the window keep their state
+        chosen = set(self.tree.selection())
+        for k, iid in enumerate(self._slots):
+            pos = self._top + k
+            if pos >= len(self._view):
+                break
+            if iid in chosen:
+                self._selected.add(self._view[pos])
+            else:
+                self._selected.discard(self._view[pos])
+
+    def _on_arrow(self, step: int) -> Optional[str]:
+        focus = self.tree.focus()
+        edge = self._slots[0] if step < 0 else self._slots[-1]
+        if focus != edge or not self._view:
+            return None  # the Treeview moves within the window itself
+        pos = min(len(self._view), len(self._slots)) - 1 if step > 0 else 0
+        self._top += step
+        self._render()
+        target = self._view[min(len(self._view) - 1, self._top + pos)]
+        self._selected = {target}
+        self._render()
+        return "break"
+
+    def _select_all(self, _event) -> str:
+        self._selected = set(self._view)
+        self._render()
+        return "break"
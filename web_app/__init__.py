@@ -8,6 +8,7 @@ def create_app() -> Flask:
     app.config.update(
         SECRET_KEY="dev-secret-change",  # replace in production
         SESSION_COOKIE_NAME="lead_scraper_session",
+        SCRAPE_WORKERS=2,  # scrape jobs run at once; further jobs wait in the queue
     )
 
     from .routes import bp as main_bp
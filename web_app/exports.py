@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import glob
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from lead_scraper.exporter import export_to_excel
+from lead_scraper.store import LeadStore
+from lead_scraper.utils import logger
+
+
+class ExcelExports:
+    """Builds Excel files of a run in the background and keeps the latest one on disk.
+
+    A file is named after the run and the store's version of it, so any new or
+    edited lead needs a new file. Each run has at most one build in flight; while
+    it runs (say, the job is still storing leads), the last finished file of the
+    run is served instead. The stale file is removed once it is replaced. `get`
+    never blocks the request.
+    """
+
+    def __init__(self, store: LeadStore, directory: str = os.path.join(".cache", "exports"), workers: int = 1) -> None:
+        self.store = store
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="excel-export")
+        self._lock = threading.Lock()
+        # run -> (path being built, its build)
+        self._builds: Dict[str, Tuple[str, Future]] = {}
+
+    def _path(self, run: str) -> str:
+        stamp = hashlib.sha1(self.store.version(run).encode()).hexdigest()[:12]
+        return os.path.join(self.directory, f"leads-{run}-{stamp}.xlsx")
+
+    def _finished(self, run: str) -> Optional[str]:
+        """The newest complete file of `run`, if any."""
+        files = glob.glob(os.path.join(self.directory, f"leads-{run}-*.xlsx"))
+        return max(files, key=os.path.getmtime) if files else None
+
+    def _build(self, run: str, path: str) -> str:
+        tmp = path + ".part"
+        count = export_to_excel(self.store.rows(run=run), tmp)
+        os.replace(tmp, path)
+        for old in glob.glob(os.path.join(self.directory, f"leads-{run}-*.xlsx")):
+            if old != path:
+                os.remove(old)
+        logger.info(f"Excel export of run {run} ready: {count} rows")
+        return path
+
+    def get(self, run: str) -> Tuple[str, Optional[str]]:
+        """("ready", path), ("building", None) or ("failed", error message).
+
+        "ready" may be an older file of the run while a build for newer data is running.
+        """
+        path = self._path(run)
+        if os.path.exists(path):
+            return "ready", path
+        # At most one build per run: one for older data is left to finish, and a
+        # later call starts the build for the current data
+        with self._lock:
+            entry = self._builds.get(run)
+            if entry is not None and entry[1].done():
+                del self._builds[run]
+                error = entry[1].exception()
+                if error is not None:
+                    logger.error(f"Excel export of run {run} failed: {error}")
+                    if entry[0] == path:
+                        return "failed", str(error)
+                entry = None
+            if entry is None:
+                self._builds[run] = (path, self._pool.submit(self._build, run, path))
+        previous = self._finished(run)
+        if previous is not None:
+            return "ready", previous
+        return "building", None
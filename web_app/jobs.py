@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+
+from lead_scraper.store import LeadStore
+from lead_scraper.utils import logger
+
+# Job states; the last three are final
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+FINAL_STATES = (DONE, FAILED, CANCELLED)
+_COLUMNS = (
+    "id", "user", "params", "state", "stage", "progress", "counts", "run", "error",
+    "cancel_requested", "created_at", "started_at", "finished_at", "updated_at", "worker", "heartbeat",
+)
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once its cancellation has been requested."""
+
+
+class JobContext:
+    """Handed to the job function: progress reporting and cancellation checks."""
+
+    def __init__(self, manager: "JobManager", job_id: str, run: str) -> None:
+        self.manager = manager
+        self.job_id = job_id
+        self.run = run
+        self._counts: Dict[str, int] = {}
+        self._checked = 0.0
+        self._cancelled = False
+
+    def progress(self, percent: int, stage: str, counts: Optional[Dict[str, int]] = None) -> None:
+        if counts:
+            self._counts.update(counts)
+        self.manager._update(self.job_id, progress=max(0, min(100, int(percent))), stage=stage, counts=json.dumps(self._counts))
+
+    def cancelled(self) -> bool:
+        if not self._cancelled and self.job_id in self.manager._cancels:
+            self._cancelled = True
+        # Cancels from another process only show up in the database, read at most once a second
+        if not self._cancelled and time.monotonic() - self._checked >= 1.0:
+            self._checked = time.monotonic()
+            self._cancelled = self.manager._cancel_requested(self.job_id)
+        return self._cancelled
+
+    def check(self) -> None:
+        if self.cancelled():
+            raise JobCancelled(self.job_id)
+
+
+JobFunction = Callable[[Dict, JobContext], None]
+
+
+class JobManager:
+    """Scrape jobs in a SQLite-backed queue, run by a fixed number of worker threads.
+
+    `workers` bounds how many scrapes (and so Chrome instances) run at once; other
+    submissions wait in the queue. Jobs, their progress and per-source counts live
+    in the database, so they survive a restart. A running job records the manager
+    that claimed it, which refreshes a heartbeat every `heartbeat` seconds; when a
+    heartbeat is older than `stale_after` the owner is taken to be dead and the job
+    is queued again, whichever process notices first. Each job writes its leads to
+    the lead store under its own `run`.
+    """
+
+    def __init__(
+        self,
+        runner: JobFunction,
+        path: str = os.path.join(".cache", "jobs.db"),
+        workers: int = 2,
+        new_run: Callable[[], str] | None = None,
+        heartbeat: float = 5.0,
+        stale_after: float = 30.0,
+    ) -> None:
+        self.runner = runner
+        self.path = path
+        self.workers = max(1, workers)
+        self._new_run = new_run or LeadStore.new_run
+        self.heartbeat = heartbeat
+        self.stale_after = max(stale_after, 2 * heartbeat)
+        # Identifies this manager as the owner of the jobs it claims
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._cancels: set = set()
+        # Jobs this manager is running right now; only these get heartbeats
+        self._active: set = set()
+        self._closed = False
+        self._stopped = threading.Event()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                user TEXT NOT NULL DEFAULT '',
+                params TEXT NOT NULL,
+                state TEXT NOT NULL,
+                stage TEXT NOT NULL DEFAULT '',
+                progress INTEGER NOT NULL DEFAULT 0,
+                counts TEXT NOT NULL DEFAULT '{}',
+                run TEXT NOT NULL,
+                error TEXT NOT NULL DEFAULT '',
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                updated_at REAL NOT NULL,
+                worker TEXT NOT NULL DEFAULT '',
+                heartbeat REAL
+            )
+            """
+        )
+        # Databases created before jobs had owners
+        existing = {r["name"] for r in self._db.execute("PRAGMA table_info(jobs)")}
+        if "worker" not in existing:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN worker TEXT NOT NULL DEFAULT ''")
+            self._db.execute("ALTER TABLE jobs ADD COLUMN heartbeat REAL")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created_at)")
+        self._threads = [
+            threading.Thread(target=self._work, name=f"scrape-job-{i}", daemon=True) for i in range(self.workers)
+        ]
+        self._threads.append(threading.Thread(target=self._beat, name="scrape-job-heartbeat", daemon=True))
+        for t in self._threads:
+            t.start()
+
+    # Queue
+
+    def submit(self, params: Dict, user: str = "") -> str:
+        job_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO jobs (id, user, params, state, run, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, user, json.dumps(params), QUEUED, self._new_run(), now, now),
+            )
+            self._wake.notify()
+        logger.info(f"Job {job_id} queued")
+        return job_id
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job at once, or ask a running one to stop; False if already final."""
+        now = time.time()
+        with self._lock:
+            changed = self._db.execute(
+                "UPDATE jobs SET state = ?, stage = 'Cancelled', finished_at = ?, updated_at = ? WHERE id = ? AND state = ?",
+                (CANCELLED, now, now, job_id, QUEUED),
+            ).rowcount
+            if not changed:
+                changed = self._db.execute(
+                    "UPDATE jobs SET cancel_requested = 1, stage = 'Cancelling...', updated_at = ? WHERE id = ? AND state = ?",
+                    (now, job_id, RUNNING),
+                ).rowcount
+                if changed:
+                    self._cancels.add(job_id)
+        return bool(changed)
+
+    def _claim(self) -> Optional[sqlite3.Row]:
+        # Caller holds the lock. BEGIN IMMEDIATE keeps two processes from taking one job.
+        try:
+            self._db.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            requeued = self._db.execute(
+                "UPDATE jobs SET state = ?, stage = 'Requeued: its worker stopped', worker = '', started_at = NULL, updated_at = ? "
+                "WHERE state = ? AND COALESCE(heartbeat, 0) < ?",
+                (QUEUED, now, RUNNING, now - self.stale_after),
+            ).rowcount
+            if requeued:
+                logger.info(f"Jobs: requeued {requeued} jobs whose worker stopped")
+            job = self._db.execute(
+                "SELECT * FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if job is not None:
+                self._db.execute(
+                    "UPDATE jobs SET state = ?, stage = 'Starting', started_at = ?, updated_at = ?, worker = ?, heartbeat = ? "
+                    "WHERE id = ?",
+                    (RUNNING, now, now, self.owner, now, job["id"]),
+                )
+            self._db.execute("COMMIT")
+        except sqlite3.Error:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            raise
+        return job
+
+    def _work(self) -> None:
+        while True:
+            with self._lock:
+                job = None
+                while not self._closed:
+                    try:
+                        job = self._claim()
+                    except sqlite3.Error as e:
+                        # Usually another process holding the write lock; try again shortly
+                        logger.warning(f"Jobs: could not claim a job: {e}")
+                        job = None
+                    if job is not None:
+                        self._active.add(job["id"])
+                        break
+                    # Also poll, for jobs queued by another process
+                    self._wake.wait(timeout=2.0)
+                if self._closed:
+                    return
+            self._run(job)
+
+    def _beat(self) -> None:
+        while not self._stopped.wait(self.heartbeat):
+            try:
+                with self._lock:
+                    active = list(self._active)
+                    if active:
+                        marks = ", ".join("?" * len(active))
+                        self._db.execute(
+                            f"UPDATE jobs SET heartbeat = ? WHERE worker = ? AND state = ? AND id IN ({marks})",
+                            (time.time(), self.owner, RUNNING, *active),
+                        )
+            except sqlite3.Error as e:
+                logger.warning(f"Jobs: could not refresh heartbeat: {e}")
+
+    def _run(self, job: sqlite3.Row) -> None:
+        job_id = job["id"]
+        ctx = JobContext(self, job_id, job["run"])
+        logger.info(f"Job {job_id} started")
+        state, error = DONE, ""
+        try:
+            self.runner(json.loads(job["params"]), ctx)
+            if ctx.cancelled():
+                state = CANCELLED
+        except JobCancelled:
+            state = CANCELLED
+        except Exception as e:  # noqa: BLE001
+            logger.exception(f"Job {job_id} failed: {e}")
+            state, error = FAILED, str(e)
+        now = time.time()
+        stage = {DONE: "Done", CANCELLED: "Cancelled", FAILED: "Failed"}[state]
+        fields = {"state": state, "stage": stage, "error": error, "finished_at": now}
+        if state == DONE:
+            fields["progress"] = 100
+        try:
+            owned = self._update(job_id, **fields)
+        except sqlite3.Error as e:
+            # Left running; once the heartbeat goes stale the job is queued again
+            logger.error(f"Job {job_id} {state} but could not be recorded: {e}")
+            owned = None
+        with self._lock:
+            self._cancels.discard(job_id)
+            self._active.discard(job_id)
+        if owned:
+            logger.info(f"Job {job_id} {state}")
+        elif owned is False:
+            logger.warning(f"Job {job_id} was requeued and taken over by another worker; this run is discarded")
+
+    def _update(self, job_id: str, **fields) -> bool:
+        # Only while this manager owns the job; a requeued job belongs to its new worker
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            return self._db.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND worker = ?", [*fields.values(), job_id, self.owner]
+            ).rowcount > 0
+
+    def _cancel_requested(self, job_id: str) -> bool:
+        """Whether the job should stop: cancelled, or requeued and claimed by another worker."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT cancel_requested, worker, state FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return True
+        if row["worker"] != self.owner or row["state"] != RUNNING:
+            logger.warning(f"Job {job_id} is no longer owned by this worker, stopping it")
+            return True
+        return bool(row["cancel_requested"])
+
+    # Queries
+
+    @staticmethod
+    def _as_dict(row: sqlite3.Row) -> Dict:
+        job = {name: row[name] for name in _COLUMNS}
+        job["params"] = json.loads(job["params"])
+        job["counts"] = json.loads(job["counts"] or "{}")
+        job["cancel_requested"] = bool(job["cancel_requested"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._as_dict(row) if row else None
+
+    def list(self, user: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        sql, params = "SELECT * FROM jobs", []
+        if user:
+            sql += " WHERE user = ?"
+            params.append(user)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [self._as_dict(r) for r in rows]
+
+    def queue_position(self, job_id: str) -> int:
+        """Jobs ahead of a queued job, or 0 once it is no longer queued."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM jobs WHERE state = ? AND created_at < "
+                "(SELECT created_at FROM jobs WHERE id = ? AND state = ?)",
+                (QUEUED, job_id, QUEUED),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wake.notify_all()
+        self._stopped.set()
@@ -1,27 +1,48 @@
 from __future__ import annotations
 
-import io
+import functools
+import itertools
 import json
-from threading import Thread
-from typing import List, Dict
+import time
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from flask import Blueprint, render_template, request, redirect, url_for, session, flash, send_file
+from flask import (
+    Blueprint, Response, current_app, render_template, request, redirect, url_for, session, flash, send_file, jsonify, abort,
+    stream_with_context,
+)
 
-from lead_scraper.exporter import export_to_csv, export_to_excel
-from lead_scraper.utils import logger, score_lead, deduplicate_records
+from lead_scraper.dedup_index import default_dedup_index
+from lead_scraper.executor import SourceExecutor, source_name
+from lead_scraper.exporter import iter_csv, iter_jsonl
+from lead_scraper.resolution import resolve_entities
+from lead_scraper.store import default_lead_store
+from lead_scraper.utils import logger, score_lead, deduplicate_records, lead_id, lead_key
 from lead_scraper.sources.google_maps import GoogleMapsScraper
 from lead_scraper.sources.yelp_selenium import YelpSeleniumScraper
 from lead_scraper.sources.yelp import YelpScraper
 from lead_scraper.sources.yellowpages import YellowPagesScraper
 from lead_scraper.sources.generic_html import GenericHTMLScraper
-from lead_scraper.sources.generic_selenium import GenericSeleniumScraper
-from lead_scraper.details import enrich_with_website_details
+from lead_scraper.sources.generic_selenium import DEFAULT_CARD_SPEC, GenericSeleniumScraper
+from lead_scraper.http_cache import default_cache
+from lead_scraper.http_client import ClientSettings
+from lead_scraper.details import iter_enriched
 import asyncio
 
+from .exports import ExcelExports
+from .jobs import FINAL_STATES, JobContext, JobManager
+
 bp = Blueprint('main', __name__)
 
 ADMIN_USER = "admin"
 ADMIN_PASS = "admin123"
+# Rows rendered on the dashboard; exports always include the whole run
+DASHBOARD_ROWS = 500
+# Enriched leads are written to the store in batches of this size
+STORE_BATCH = 50
+# How often a job's event stream checks for progress and new leads, and sends a keep-alive
+EVENTS_POLL_SECONDS = 0.5
+EVENTS_KEEPALIVE_SECONDS = 15.0
 
 
 def login_required(view):
@@ -62,91 +83,184 @@ def logout():
 @bp.route("/dashboard", methods=["GET"]) 
 @login_required
 def dashboard():
-    leads = session.get("leads") or []
-    return render_template("dashboard.html", leads=leads)
+    store = default_lead_store()
+    job = jobs_manager().get(request.args.get("job", "")) if request.args.get("job") else None
+    run = job["run"] if job else store.latest_run()
+    # Leads changed after this are left to the job's event stream; the margin only causes resends
+    since = time.time() - 1.0
+    leads = list(store.rows(run=run, limit=DASHBOARD_ROWS)) if run else []
+    total = store.count(run=run) if run else 0
+    return render_template(
+        "dashboard.html", leads=leads, total=total, run=run, job=job, since=since, max_rows=DASHBOARD_ROWS,
+        jobs=jobs_manager().list(user=session.get("user")), final_states=FINAL_STATES,
+    )
 
 
-def run_scrape_async(params: Dict):
-    try:
-        keyword = params.get("keyword", "").strip()
-        location = params.get("location", "").strip()
-        target_url = params.get("target_url", "").strip()
-        headless = params.get("headless", True)
-        max_pages = int(params.get("max_pages", 5))
-        concurrency = int(params.get("concurrency", 10))
-        delay = float(params.get("delay", 0.5))
-
-        selected = []
-        if params.get("src_gmaps"):
-            selected.append(GoogleMapsScraper(headless=headless))
-        if params.get("src_yelp_s"):
-            selected.append(YelpSeleniumScraper(headless=headless))
-        if params.get("src_yelp_r"):
-            selected.append(YelpScraper())
-        if params.get("src_yp"):
-            selected.append(YellowPagesScraper())
-        if params.get("src_gen_s") and target_url:
-            selected.append(GenericSeleniumScraper(headless=headless))
-        if params.get("src_gen_h") and target_url:
-            selected.append(GenericHTMLScraper())
-
-        all_rows: List[Dict[str, str]] = []
-        for scraper in selected:
-            if isinstance(scraper, GenericSeleniumScraper) and target_url:
-                rows = scraper.search(
-                    start_url=target_url,
-                    locate_cards_css="div[role='article'], .result, .v-card, .container__09f24__mpR8_",
-                    parse_card=lambda el: {
-                        "name": (el.text or "").split("\n")[0],
-                        "website": "",
-                        "email": "",
-                        "phone": "",
-                        "address": "",
-                        "socials": "",
-                    },
-                    next_button_css="a.next, a[aria-label='Next']",
-                    max_pages=max_pages,
-                )
-            elif isinstance(scraper, GenericHTMLScraper) and target_url:
-                rows = scraper.search(
-                    start_url=target_url,
-                    select_cards="div[role='article'], .result, .v-card, li",
-                    parse_card=lambda s: {
-                        "name": (s.get_text(" ").strip().split("\n")[0]),
-                        "website": "",
-                        "email": "",
-                        "phone": "",
-                        "address": "",
-                        "socials": "",
-                    },
-                    next_selector="a.next, a[aria-label='Next']",
-                    max_pages=max_pages,
-                )
-            else:
-                try:
-                    rows = scraper.search(keyword, location, max_pages=max_pages)  # type: ignore[arg-type]
-                except TypeError:
-                    rows = scraper.search(keyword, location)
-            for r in rows:
-                r["source"] = getattr(scraper, "name", type(scraper).__name__)
-                r["status"] = r.get("status", "New")
-                r["notes"] = r.get("notes", "")
-                r["score"] = score_lead(r)
-            all_rows.extend(rows)
-
-        all_rows = deduplicate_records(all_rows)
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        enriched = loop.run_until_complete(
-            enrich_with_website_details(all_rows, concurrency=concurrency, delay_seconds=delay)
-        )
-        loop.close()
-        for r in enriched:
+@functools.lru_cache(maxsize=1)
+def excel_exports() -> ExcelExports:
+    return ExcelExports(default_lead_store())
+
+
+@functools.lru_cache(maxsize=1)
+def jobs_manager() -> JobManager:
+    return JobManager(run_scrape, workers=current_app.config.get("SCRAPE_WORKERS", 2))
+
+
+@bp.route("/leads/<ident>", methods=["GET"])
+@login_required
+def lead_detail(ident: str):
+    lead = default_lead_store().get(ident)
+    if lead is None:
+        abort(404)
+    return jsonify(lead)
+
+
+@bp.route("/leads/status", methods=["POST"])
+@login_required
+def set_lead_status():
+    ids = request.form.getlist("ids")
+    status = request.form.get("status", "").strip()
+    if not ids or not status:
+        flash("Select leads and a status first", "warning")
+        return redirect(url_for("main.dashboard"))
+    changed = default_lead_store().update(ids, status=status)
+    flash(f"Updated status for {changed} leads.", "info")
+    return redirect(url_for("main.dashboard"))
+
+
+def run_scrape(params: Dict, job: JobContext) -> None:
+    """One scrape job: leads go to the store under `job.run`, progress to the job record."""
+    store = default_lead_store()
+    run = job.run
+    keyword = params.get("keyword", "").strip()
+    location = params.get("location", "").strip()
+    target_url = params.get("target_url", "").strip()
+    headless = params.get("headless", True)
+    max_pages = int(params.get("max_pages", 5))
+    concurrency = int(params.get("concurrency", 10))
+    delay = float(params.get("delay", 0.5))
+    page_concurrency = int(params.get("page_concurrency", 3))
+    detail_workers = int(params.get("detail_workers", 3))
+    cache = default_cache() if params.get("use_cache") else None
+    per_host = max(1, int(params.get("per_host", 5)))
+    client_settings = ClientSettings(
+        max_connections=max(1, concurrency) * per_host,
+        max_keepalive_connections=max(1, concurrency) * 2,
+        per_host_connections=per_host,
+        http2=bool(params.get("http2")),
+    )
+
+    selected = []
+    if params.get("src_gmaps"):
+        selected.append(GoogleMapsScraper(headless=headless, detail_workers=detail_workers))
+    if params.get("src_yelp_s"):
+        selected.append(YelpSeleniumScraper(headless=headless))
+    if params.get("src_yelp_r"):
+        selected.append(YelpScraper(concurrency=page_concurrency, cache=cache))
+    if params.get("src_yp"):
+        selected.append(YellowPagesScraper(concurrency=page_concurrency, cache=cache))
+    if params.get("src_gen_s") and target_url:
+        selected.append(GenericSeleniumScraper(headless=headless))
+    if params.get("src_gen_h") and target_url:
+        selected.append(GenericHTMLScraper(cache=cache))
+
+    def run_source(scraper) -> List[Dict[str, str]]:
+        if isinstance(scraper, GenericSeleniumScraper) and target_url:
+            return scraper.search(
+                start_url=target_url,
+                locate_cards_css="div[role='article'], .result, .v-card, .container__09f24__mpR8_",
+                parse_card=lambda card: {
+                    "name": card.get("text", "").split("\n")[0],
+                    "website": "",
+                    "email": "",
+                    "phone": "",
+                    "address": "",
+                    "socials": "",
+                },
+                next_button_css="a.next, a[aria-label='Next']",
+                max_pages=max_pages,
+                card_spec=DEFAULT_CARD_SPEC,
+                stop_flag=job.cancelled,
+            )
+        if isinstance(scraper, GenericHTMLScraper) and target_url:
+            return scraper.search(
+                start_url=target_url,
+                select_cards="div[role='article'], .result, .v-card, li",
+                parse_card=lambda card: {
+                    "name": scraper.parser.text(scraper.parser.select_one(card, "a, h3, h4")) or scraper.parser.text(card),
+                    "website": "",
+                    "email": "",
+                    "phone": "",
+                    "address": "",
+                    "socials": "",
+                },
+                next_selector="a.next, a[aria-label='Next']",
+                max_pages=max_pages,
+                stop_flag=job.cancelled,
+            )
+        try:
+            return scraper.search(keyword, location, max_pages=max_pages, stop_flag=job.cancelled)  # type: ignore[arg-type]
+        except TypeError:
+            return scraper.search(keyword, location)
+
+    all_rows: List[Dict[str, str]] = []
+    job.progress(0, f"Scraping {len(selected)} sources")
+    finished = 0
+    # One browser source per Chrome instance the detail workers may hold; the HTTP sources
+    # together keep about `concurrency` pages in flight
+    executor = SourceExecutor(browser_workers=detail_workers, http_workers=concurrency // max(1, page_concurrency))
+    for scraper, rows in executor.stream(selected, run_source, stop_flag=job.cancelled):
+        finished += 1
+        job.progress(40 * finished // max(1, len(selected)), f"Scraped {source_name(scraper)}", {source_name(scraper): len(rows)})
+        for r in rows:
+            lead_id(r)
+            r["source"] = source_name(scraper)
+            r["status"] = r.get("status", "New")
+            r["notes"] = r.get("notes", "")
             r["score"] = score_lead(r)
-        session["leads"] = enriched
-    except Exception as e:
-        logger.exception(f"Flask scrape error: {e}")
-        session["leads"] = []
+        all_rows.extend(rows)
+    job.check()
+
+    job.progress(45, "Removing duplicates")
+    all_rows = resolve_entities(deduplicate_records(all_rows))
+    seen_keys: Dict[str, bytes] = {}
+    if params.get("skip_seen"):
+        # Leads count as seen once stored enriched, so a cancelled job doesn't hide them
+        all_rows = list(default_dedup_index().filter_new(all_rows, record=False))
+        seen_keys = {lead_id(r): lead_key(r) for r in all_rows}
+
+    # Stored before enrichment so the dashboard shows the run while it is enriched
+    store.upsert(all_rows, run)
+    job.progress(50, f"Enriching {len(all_rows)} leads")
+
+    def store_enriched(rows: List[Dict[str, str]]) -> int:
+        written = store.upsert(rows, run)
+        if seen_keys:
+            default_dedup_index().add_keys(seen_keys[lead_id(r)] for r in rows if lead_id(r) in seen_keys)
+        return written
+
+    async def enrich_all() -> int:
+        pending: List[Dict[str, str]] = []
+        done = 0
+        enriching = iter_enriched(all_rows, concurrency=concurrency, delay_seconds=delay, cache=cache, client_settings=client_settings)
+        try:
+            async for r in enriching:
+                r["score"] = score_lead(r)
+                pending.append(r)
+                if len(pending) >= STORE_BATCH:
+                    done += store_enriched(pending)
+                    pending = []
+                    job.progress(50 + 45 * done // max(1, len(all_rows)), f"Enriched {done} of {len(all_rows)} leads")
+                    if job.cancelled():
+                        break
+        finally:
+            # Breaking out of `async for` leaves the generator open; closing it cancels the
+            # pending fetches and closes the HTTP client
+            await enriching.aclose()
+        return done + store_enriched(pending)
+
+    enriched = asyncio.run(enrich_all())
+    logger.info(f"Run {run}: stored {enriched} leads")
 
 
 @bp.route("/start", methods=["POST"]) 
@@ -157,9 +271,15 @@ def start_scrape():
         "location": request.form.get("location", ""),
         "target_url": request.form.get("target_url", ""),
         "headless": request.form.get("headless") == "on",
+        "use_cache": request.form.get("use_cache") == "on",
+        "skip_seen": request.form.get("skip_seen") == "on",
         "max_pages": request.form.get("max_pages", 5),
         "concurrency": request.form.get("concurrency", 10),
         "delay": request.form.get("delay", 0.5),
+        "page_concurrency": request.form.get("page_concurrency", 3),
+        "per_host": request.form.get("per_host", 5),
+        "detail_workers": request.form.get("detail_workers", 3),
+        "http2": request.form.get("http2") == "on",
         "src_gmaps": bool(request.form.get("src_gmaps")),
         "src_yelp_s": bool(request.form.get("src_yelp_s")),
         "src_yelp_r": bool(request.form.get("src_yelp_r")),
@@ -167,40 +287,189 @@ def start_scrape():
         "src_gen_s": bool(request.form.get("src_gen_s")),
         "src_gen_h": bool(request.form.get("src_gen_h")),
     }
-    t = Thread(target=run_scrape_async, args=(params,))
-    t.daemon = True
-    t.start()
-    flash("Scraping started. Refresh the dashboard after a bit.", "info")
-    return redirect(url_for("main.dashboard"))
+    job_id = jobs_manager().submit(params, user=session.get("user", ""))
+    flash("Scraping job queued.", "info")
+    return redirect(url_for("main.dashboard", job=job_id))
+
 
+def _job_or_404(job_id: str) -> Dict:
+    job = jobs_manager().get(job_id)
+    if job is None or job["user"] != session.get("user"):
+        abort(404)
+    return job
 
-@bp.route("/export/csv") 
+
+@bp.route("/jobs", methods=["GET"])
 @login_required
-def export_csv_route():
-    rows = session.get("leads") or []
-    if not rows:
+def list_jobs():
+    return jsonify(jobs_manager().list(user=session.get("user")))
+
+
+@bp.route("/jobs/<job_id>", methods=["GET"])
+@login_required
+def job_detail(job_id: str):
+    job = _job_or_404(job_id)
+    job["queue_position"] = jobs_manager().queue_position(job_id)
+    job["leads"] = default_lead_store().count(run=job["run"])
+    return jsonify(job)
+
+
+def _sse(event: str, data, event_id: Optional[str] = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def _parse_cursor(value: str) -> Optional[Tuple[float, str]]:
+    stamp, _, ident = value.partition(":")
+    try:
+        return float(stamp), ident
+    except ValueError:
+        return None
+
+
+@bp.route("/jobs/<job_id>/events", methods=["GET"])
+@login_required
+def job_events(job_id: str):
+    """Server-Sent Events for one job until it finishes.
+
+    "progress" carries the job record (state, stage, progress, per-source counts)
+    and the run's lead count whenever it changes; "leads" carries leads of the run
+    added or updated since the last event, so enriched leads arrive as they are
+    stored; "done" is sent once the job is final and every lead has been sent.
+    The id of a "leads" event is a store cursor, so a reconnecting EventSource
+    resumes where it left off; `?since=<timestamp>` skips older leads on the
+    first connect (the dashboard already rendered them).
+    """
+    job = _job_or_404(job_id)
+    manager, store, run = jobs_manager(), default_lead_store(), job["run"]
+    cursor = _parse_cursor(request.headers.get("Last-Event-ID", "")) or _parse_cursor(request.args.get("since", "") + ":")
+
+    def events() -> Iterator[str]:
+        nonlocal cursor
+        last_state = None
+        last_sent = time.monotonic()
+        while True:
+            job = manager.get(job_id)
+            if job is None:
+                return
+            finished = job["state"] in FINAL_STATES
+            while True:
+                leads = store.changes(run, cursor, limit=DASHBOARD_ROWS)
+                if not leads:
+                    break
+                cursor = (leads[-1]["updated_at"], leads[-1]["id"])
+                yield _sse("leads", leads, f"{cursor[0]!r}:{cursor[1]}")
+                last_sent = time.monotonic()
+            state = (job["state"], job["stage"], job["progress"], job["counts"], job["cancel_requested"])
+            if state != last_state:
+                last_state = state
+                yield _sse("progress", {**job, "leads": store.count(run=run), "queue_position": manager.queue_position(job_id)})
+                last_sent = time.monotonic()
+            if finished:
+                yield _sse("done", {"state": job["state"], "error": job["error"]})
+                return
+            if time.monotonic() - last_sent >= EVENTS_KEEPALIVE_SECONDS:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            time.sleep(EVENTS_POLL_SECONDS)
+
+    resp = Response(events(), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # stop nginx from holding events back
+    return resp
+
+
+@bp.route("/jobs/<job_id>/cancel", methods=["POST"])
+@login_required
+def cancel_job(job_id: str):
+    _job_or_404(job_id)
+    if jobs_manager().cancel(job_id):
+        flash("Cancelling the job.", "info")
+    else:
+        flash("The job has already finished.", "warning")
+    return redirect(url_for("main.dashboard", job=job_id))
+
+
+def _export_run():
+    run = request.args.get("run") or default_lead_store().latest_run()
+    if not run:
         flash("No data to export", "warning")
+    return run
+
+
+def _streamed(chunks: Iterator[str], filename: str, mimetype: str) -> Response:
+    """Send text chunks as they are produced, gzip-encoded when the client accepts it."""
+    # quality() honours q-values, so "gzip;q=0" turns it off
+    use_gzip = request.args.get("gzip", "1") != "0" and request.accept_encodings.quality("gzip") > 0
+
+    def body() -> Iterator[bytes]:
+        if not use_gzip:
+            for chunk in chunks:
+                yield chunk.encode("utf-8")
+            return
+        packer = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31 writes a gzip container
+        for chunk in chunks:
+            data = packer.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield packer.flush()
+
+    resp = Response(stream_with_context(body()), mimetype=mimetype)
+    resp.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    if use_gzip:
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.headers["Vary"] = "Accept-Encoding"
+    return resp
+
+
+@bp.route("/export/csv")
+@login_required
+def export_csv_route():
+    run = _export_run()
+    if not run:
+        return redirect(url_for("main.dashboard"))
+    # The BOM lets Excel detect UTF-8, as the file exports do
+    chunks = itertools.chain(["\ufeff"], iter_csv(default_lead_store().rows(run=run)))
+    return _streamed(chunks, "leads.csv", "text/csv")
+
+
+@bp.route("/export/jsonl")
+@login_required
+def export_jsonl_route():
+    run = _export_run()
+    if not run:
         return redirect(url_for("main.dashboard"))
-    bio = io.BytesIO()
-    # Use pandas writer in memory
-    import pandas as pd
-    df = pd.DataFrame(rows)
-    df.to_csv(bio, index=False, encoding="utf-8-sig")
-    bio.seek(0)
-    return send_file(bio, as_attachment=True, download_name="leads.csv", mimetype="text/csv")
+    return _streamed(iter_jsonl(default_lead_store().rows(run=run)), "leads.jsonl", "application/x-ndjson")
 
 
-@bp.route("/export/excel") 
+@bp.route("/export/excel")
 @login_required
 def export_excel_route():
-    rows = session.get("leads") or []
-    if not rows:
-        flash("No data to export", "warning")
+    run = _export_run()
+    if not run:
         return redirect(url_for("main.dashboard"))
-    bio = io.BytesIO()
-    import pandas as pd
-    df = pd.DataFrame(rows)
-    with pd.ExcelWriter(bio, engine='openpyxl') as writer:
-        df.to_excel(writer, index=False)
-    bio.seek(0)
-    return send_file(bio, as_attachment=True, download_name="leads.xlsx", mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    state, detail = excel_exports().get(run)
+    if state == "ready":
+        try:
+            return send_file(
+                detail, as_attachment=True, download_name="leads.xlsx",
+                mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+        except FileNotFoundError:
+            # Replaced by a newer build in the meantime
+            state = "building"
+    if state == "failed":
+        flash(f"Excel export failed: {detail}", "error")
+    else:
+        flash("The Excel file is being prepared. Click Download Excel again in a moment.", "info")
+    return redirect(url_for("main.dashboard"))
+
+
+@bp.route("/export/excel/status")
+@login_required
+def export_excel_status():
+    run = request.args.get("run") or default_lead_store().latest_run()
+    if not run:
+        return jsonify({"state": "empty"})
+    state, detail = excel_exports().get(run)
+    return jsonify({"state": state, "error": detail if state == "failed" else None})